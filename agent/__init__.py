@@ -13,36 +13,84 @@ Agent 模块初始化文件 (__init__.py)
     from agent.tools import *
     from agent.progress import *
 
-导出的模块和类：
+导出的类（__all__）：
 - CodingAgent: 核心编程 Agent 类
+
+可按需访问的子模块：
 - tools: 工具函数模块
 - progress: 进度管理模块
 - security: 安全控制模块
 - prompts: 提示词模板模块
 - git_helper: Git 操作辅助模块
+- event_logger: 事件日志模块
+
+说明：
+    CodingAgent 与子模块均采用 PEP 562 的模块级 __getattr__ 延迟加载，
+    仅在首次访问对应名称时才导入，避免 `import agent`
+    时加载 LLM SDK 等重量级依赖。
+    同目录下的 __init__.pyi 以显式导入声明公开接口，
+    供类型检查器与 IDE 使用；新增公开名称时需同步更新。
 """
 
-# 导入核心类和函数，供外部使用
-from .agent import CodingAgent
-from . import tools
-from . import progress
-from . import security
-from . import prompts
-from . import git_helper
-from . import event_logger
+import importlib
+
+# 延迟加载映射表：子模块名称 -> 相对导入路径
+_LAZY = {
+    "tools": ".tools",
+    "progress": ".progress",
+    "security": ".security",
+    "prompts": ".prompts",
+    "git_helper": ".git_helper",
+    "event_logger": ".event_logger",
+}
+
+# 延迟加载的类：公开名称 -> (相对导入路径, 模块内属性名)
+# 直接返回真实类，保证子类化、isinstance 与 inspect.signature 行为一致
+_LAZY_ATTRS = {
+    "CodingAgent": (".agent", "CodingAgent"),
+}
 
 # 定义公开接口
 # 当使用 from agent import * 时，只会导入这些名称
+# 子模块仍可通过 agent.tools 等方式访问，但不会被 import * 物化
 __all__ = [
     "CodingAgent",   # 核心 Agent 类
-    "tools",         # 工具模块
-    "progress",      # 进度管理模块
-    "security",      # 安全控制模块
-    "prompts",       # 提示词模块
-    "git_helper",    # Git 辅助模块
-    "event_logger",  # 事件日志模块
 ]
 
 # 版本信息
+# 保持为字面量常量：不要改为 importlib.metadata.version(...)，
+# 否则每次 import agent 都会扫描 site-packages 中的发行包元数据
 __version__ = "0.1.0"
 __author__ = "Autonomous Coding Agent Project"
+
+
+def __getattr__(name):
+    """
+    按需加载公开名称（PEP 562）
+
+    参数:
+        name: 访问的属性名称
+
+    返回:
+        Any: 对应的子模块或类
+
+    说明:
+        首次访问后结果写入模块全局字典，后续访问不再经过本函数。
+    """
+    if name in _LAZY_ATTRS:
+        module_path, attr = _LAZY_ATTRS[name]
+        value = getattr(importlib.import_module(module_path, __name__), attr)
+        globals()[name] = value
+        return value
+
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(_LAZY[name], __name__)
+    globals()[name] = module
+    return module
+
+
+def __dir__():
+    """返回包含延迟加载名称的属性列表，保证 REPL 补全可用。"""
+    return sorted(set(globals()) | set(_LAZY) | set(_LAZY_ATTRS))
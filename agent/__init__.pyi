@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+# agent 包的类型存根：运行时由 __init__.py 的 __getattr__ 延迟加载，
+# 这里以显式导入的形式声明公开接口，供类型检查器与 IDE 跳转使用。
+
+from .agent import CodingAgent as CodingAgent
+from . import tools as tools
+from . import progress as progress
+from . import security as security
+from . import prompts as prompts
+from . import git_helper as git_helper
+from . import event_logger as event_logger
+
+__all__ = [
+    "CodingAgent",
+]
+
+__version__: str
+__author__: str
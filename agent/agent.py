@@ -11,27 +11,28 @@ Agent 核心模块 (agent.py)
 说明：
 - 优先尝试使用 LangGraph 的 `create_react_agent`
 - 如果 LangGraph 不可用或初始化失败，自动回退到简单执行器
+- LangGraph 在首次创建执行器时才导入（见 `_load_create_react_agent`），
+  langchain_openai 在创建 CodingAgent 时才导入（见 `_init_llm`），
+  导入本模块本身不会加载这两个依赖
 """
 
-import json
+import asyncio
+import copy
 import os
-import shlex
+import signal
 import subprocess
 import sys
+import threading
 import time
+import weakref
 import hashlib
-from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from functools import lru_cache, partial, wraps
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, List, Mapping, Optional, Tuple
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
-
-try:
-    from langgraph.prebuilt import create_react_agent
-
-    LANGGRAPH_AVAILABLE = True
-except ImportError:
-    LANGGRAPH_AVAILABLE = False
 
 # 项目内部导入
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -39,9 +40,136 @@ from config import Config, set_project_dir
 from .git_helper import GitHelper, format_commits_for_prompt
 from .progress import Feature, ProgressManager
 from .prompts import get_system_prompt, loader as prompt_loader
-from .security import get_validator
+from .response_cache import ResponseCache
+from .security import get_validator, split_command
+from .shell_worker import PersistentBashWorker
 from .tools import get_all_tools
-from .event_logger import emit_event, get_event_logger, setup_event_logger, update_event_context
+from .event_logger import (
+    dumps_json_line,
+    emit_event,
+    flush_event_log,
+    get_event_logger,
+    now_str,
+    setup_event_logger,
+    update_event_context,
+)
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+
+def _build_system_message(system_prompt: str) -> SystemMessage:
+    """
+    构建系统消息。
+
+    同一会话内复用同一个消息对象，保证发送给模型服务的前缀逐字节一致，
+    便于服务端的前缀缓存命中；开启 `Config.PROMPT_CACHE_CONTROL` 时
+    额外附加 `cache_control` 标记（仅适用于支持该字段的服务端）。
+    """
+    return _cached_system_message(system_prompt, Config.PROMPT_CACHE_CONTROL)
+
+
+@lru_cache(maxsize=4)
+def _cached_system_message(system_prompt: str, cache_control: bool) -> SystemMessage:
+    """
+    按（提示词内容, 是否附加 cache_control）缓存系统消息对象。
+
+    连续模式下每轮新建的 Agent 实例共享同一个对象；
+    提示词文件重新加载后内容变化，自然得到新的缓存键。
+    """
+    if cache_control:
+        return SystemMessage(
+            content=[
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+        )
+    return SystemMessage(content=system_prompt)
+
+
+# 历史消息角色到 LangChain 消息类型的映射，未知角色按系统消息处理
+_ROLE_TO_MESSAGE_CLS = {
+    "human": HumanMessage,
+    "user": HumanMessage,
+    "ai": AIMessage,
+    "assistant": AIMessage,
+}
+_HISTORY_MESSAGE_TYPES = (HumanMessage, AIMessage, SystemMessage)
+
+
+def _message_from_role(role: Any, content: Any) -> Any:
+    """按角色名构造消息对象。"""
+    message_cls = _ROLE_TO_MESSAGE_CLS.get(str(role).lower(), SystemMessage)
+    return message_cls(content=str(content))
+
+
+def _message_from_tuple(item: tuple) -> Optional[Any]:
+    """(role, content) 元组转换为消息对象，长度不符时返回 None。"""
+    if len(item) != 2:
+        return None
+    return _message_from_role(item[0], item[1])
+
+
+def _message_from_dict(item: dict) -> Any:
+    """{"role": ..., "content": ...} 字典转换为消息对象。"""
+    return _message_from_role(item.get("role", ""), item.get("content", ""))
+
+
+def _message_passthrough(item: Any) -> Any:
+    """已是 LangChain 消息对象时原样返回。"""
+    return item
+
+
+# 按精确类型分派的历史条目转换函数；子类型（如 namedtuple）走 isinstance 回退路径
+_HISTORY_NORMALIZERS: Dict[type, Callable[[Any], Optional[Any]]] = {
+    tuple: _message_from_tuple,
+    dict: _message_from_dict,
+    HumanMessage: _message_passthrough,
+    AIMessage: _message_passthrough,
+    SystemMessage: _message_passthrough,
+}
+
+
+class _IncrementalHistory:
+    """
+    追加式对话历史的增量标准化缓冲区。
+
+    调用方维护一个只追加的原始历史列表，每次调用 sync() 时只标准化
+    新增的条目；若历史被截断或替换（末尾已同步条目不再是同一对象），
+    则整体重建。
+    """
+
+    __slots__ = ("messages", "_consumed", "_tail")
+
+    def __init__(self) -> None:
+        """初始化空缓冲区。"""
+        self.messages: List[Any] = []
+        self._consumed = 0
+        self._tail: Any = None
+
+    def sync(self, history: List[Any]) -> List[Any]:
+        """
+        同步原始历史并返回标准化后的消息列表。
+
+        参数:
+            history: 调用方维护的原始历史
+
+        返回:
+            List[Any]: 缓冲区内部的消息列表（调用方不应修改）
+        """
+        consumed = self._consumed
+        if len(history) < consumed or (consumed and history[consumed - 1] is not self._tail):
+            self.messages = []
+            consumed = 0
+
+        if len(history) > consumed:
+            self.messages.extend(SimpleAgentExecutor._normalize_chat_history(history[consumed:]))
+        self._consumed = len(history)
+        self._tail = history[-1] if history else None
+        return self.messages
 
 
 class SimpleAgentExecutor:
@@ -52,60 +180,436 @@ class SimpleAgentExecutor:
     发送给 LLM，作为 LangGraph 不可用时的回退方案。
     """
 
-    def __init__(self, llm: ChatOpenAI, tools: List[Any]):
-        """初始化回退执行器。"""
+    def __init__(
+        self,
+        llm: "ChatOpenAI",
+        tools: List[Any],
+        system_prompt: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
+        """初始化回退执行器，系统提示词在构造时确定并在每次调用中复用；可选传入响应缓存。"""
         self.llm = llm
         self.tools = tools
+        self.system_prompt = system_prompt if system_prompt is not None else get_system_prompt()
+        self._system_message = _build_system_message(self.system_prompt)
+        self._history = _IncrementalHistory()
+        self.response_cache = response_cache
 
     @staticmethod
     def _normalize_chat_history(chat_history: List[Any]) -> List[Any]:
         """将多种历史消息格式标准化为 LangChain 消息对象列表。"""
-        normalized: List[Any] = []
-        for item in chat_history or []:
-            if isinstance(item, (HumanMessage, AIMessage, SystemMessage)):
-                normalized.append(item)
-                continue
-
-            if isinstance(item, tuple) and len(item) == 2:
-                role, content = item
-                role_str = str(role).lower()
-                if role_str in {"human", "user"}:
-                    normalized.append(HumanMessage(content=str(content)))
-                elif role_str in {"ai", "assistant"}:
-                    normalized.append(AIMessage(content=str(content)))
-                else:
-                    normalized.append(SystemMessage(content=str(content)))
-                continue
-
-            if isinstance(item, dict):
-                role_str = str(item.get("role", "")).lower()
-                content = str(item.get("content", ""))
-                if role_str in {"human", "user"}:
-                    normalized.append(HumanMessage(content=content))
-                elif role_str in {"ai", "assistant"}:
-                    normalized.append(AIMessage(content=content))
-                else:
-                    normalized.append(SystemMessage(content=content))
+        if not chat_history:
+            return []
+        # 常见情况：调用方已传入 LangChain 消息对象，直接复制返回
+        if all(isinstance(item, _HISTORY_MESSAGE_TYPES) for item in chat_history):
+            return list(chat_history)
+
+        return [
+            message
+            for message in map(SimpleAgentExecutor._normalize_message, chat_history)
+            if message is not None
+        ]
+
+    @staticmethod
+    def _normalize_message(item: Any) -> Optional[Any]:
+        """将单条历史记录转换为消息对象，无法识别的格式返回 None。"""
+        handler = _HISTORY_NORMALIZERS.get(type(item))
+        if handler is not None:
+            return handler(item)
+        if isinstance(item, _HISTORY_MESSAGE_TYPES):
+            return item
+        if isinstance(item, tuple):
+            return _message_from_tuple(item)
+        if isinstance(item, dict):
+            return _message_from_dict(item)
+        return None
+
+    def _build_messages(self, inputs: Dict[str, Any]) -> List[Any]:
+        """
+        按 系统提示词 + 历史 + 当前输入 的顺序组装消息列表。
 
-        return normalized
+        历史通过增量缓冲区标准化，连续调用时只处理新增条目。
+        """
+        messages: List[Any] = [self._system_message]
+        messages.extend(self._history.sync(inputs.get("chat_history") or []))
+        messages.append(HumanMessage(content=str(inputs.get("input", ""))))
+        return messages
+
+    def _cache_key(self, messages: List[Any]) -> Optional[str]:
+        """按模型、温度与完整消息列表计算响应缓存键，未启用缓存时返回 None。"""
+        if self.response_cache is None:
+            return None
+        return ResponseCache.make_key(
+            getattr(self.llm, "model_name", None),
+            getattr(self.llm, "temperature", None),
+            [(getattr(message, "type", ""), getattr(message, "content", "")) for message in messages],
+        )
 
     def invoke(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
-        """执行一次 LLM 调用并返回统一的输出结构。"""
-        input_text = str(inputs.get("input", ""))
-        chat_history = self._normalize_chat_history(inputs.get("chat_history", []))
+        """执行一次 LLM 调用并返回统一的输出结构，命中响应缓存时不请求模型。"""
+        messages = self._build_messages(inputs)
+        key = self._cache_key(messages)
+        if key is not None:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return {"output": cached}
+        response = self.llm.invoke(messages)
+        output = str(getattr(response, "content", str(response)))
+        if key is not None:
+            self.response_cache.put(key, output)
+        return {"output": output}
+
+    async def ainvoke(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """异步执行一次 LLM 调用，返回结构与缓存行为与 invoke() 一致。"""
+        messages = self._build_messages(inputs)
+        key = self._cache_key(messages)
+        if key is not None:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return {"output": cached}
+        response = await self.llm.ainvoke(messages)
+        output = str(getattr(response, "content", str(response)))
+        if key is not None:
+            self.response_cache.put(key, output)
+        return {"output": output}
+
+
+@lru_cache(maxsize=None)
+def _load_create_react_agent() -> Optional[Callable[..., Any]]:
+    """
+    按需导入 LangGraph 的 `create_react_agent`。
 
-        messages: List[Any] = [SystemMessage(content=get_system_prompt())]
-        messages.extend(chat_history)
-        messages.append(HumanMessage(content=input_text))
+    结果会被缓存，LangGraph 缺失时也只探测一次，
+    避免连续模式下每轮新建 Agent 都重复搜索导入路径。
 
-        response = self.llm.invoke(messages)
-        content = getattr(response, "content", str(response))
-        return {"output": str(content)}
+    返回:
+        Optional[Callable[..., Any]]: 工厂函数，不可用时返回 None
+    """
+    try:
+        from langgraph.prebuilt import create_react_agent
+    except ImportError:
+        return None
+    return create_react_agent
+
+
+def _extract_output_from_dict(result: Dict[str, Any]) -> str:
+    """从 LangGraph 状态字典中提取最终文本（优先 output，其次最后一条消息）。"""
+    if "output" in result:
+        return str(result["output"])
+    messages = result.get("messages")
+    if isinstance(messages, list) and messages:
+        last_msg = messages[-1]
+        return str(getattr(last_msg, "content", last_msg))
+    return str(result)
+
+
+# 按结果的精确类型分派，覆盖 LangGraph 返回的常见形态
+_OUTPUT_EXTRACTORS: Dict[type, Callable[[Any], str]] = {
+    dict: _extract_output_from_dict,
+    str: lambda result: result,
+    type(None): lambda result: "",
+}
 
 
-def _is_compound_shell_command(command: str) -> bool:
-    """判断命令是否包含复合控制符（&&、||、;、|）。"""
-    return any(token in command for token in ["&&", "||", ";", "|"])
+def _format_timestamp(timestamp: float) -> str:
+    """将 Unix 时间戳格式化为本地时间文本。"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+def _serialized(method: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    在实例的 _run_lock 下执行方法的装饰器
+
+    说明:
+        create_agent 返回的共享实例可能被多个线程同时调用，
+        run/initialize/chat/close 会读写迭代计数、会话历史与运行日志缓冲等实例状态，
+        因此同一实例上的这些入口串行执行；不同实例之间互不阻塞。
+    """
+
+    @wraps(method)
+    def wrapper(self: "CodingAgent", *args: Any, **kwargs: Any) -> Any:
+        with self._run_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _report_iteration_callback_error(iteration: int, future: Future) -> None:
+    """
+    记录 on_iteration 回调中抛出的异常
+
+    参数:
+        iteration: 回调对应的迭代序号
+        future: 回调线程池返回的 Future
+
+    说明:
+        回调在线程池中执行，未处理的异常只会留在 Future 中；
+        这里在回调完成时输出到控制台并写入 error 事件，避免静默丢失。
+    """
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is None:
+        return
+    print(f"[Agent] on_iteration 回调执行失败: {exc!r}")
+    emit_event(
+        event_type="error",
+        component="agent",
+        name="on_iteration",
+        payload={"message": repr(exc)},
+        ok=False,
+        iteration=iteration,
+        phase="run",
+    )
+
+
+def _run_coroutine_sync(coro: Any) -> Any:
+    """
+    在同步代码中执行协程并返回结果
+
+    参数:
+        coro: 待执行的协程对象
+
+    返回:
+        Any: 协程的返回值
+
+    说明:
+        当前线程已有运行中的事件循环时（如在 async 应用或 Jupyter 中调用同步接口），
+        asyncio.run 会抛出 RuntimeError，此时改在独立线程中以新的事件循环执行并等待结果。
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+@lru_cache(maxsize=8)
+def _static_project_header(project_name: str, tech_stack: str, init_command: str) -> str:
+    """
+    生成会话上下文中不随迭代变化的项目信息头部。
+
+    参数:
+        project_name: 项目名称
+        tech_stack: 技术栈描述
+        init_command: 启动命令
+
+    返回:
+        str: 已拼接好的多行头部文本
+    """
+    return "\n".join(
+        [
+            "## 会话上下文",
+            "",
+            "### 项目信息",
+            f"- 名称: {project_name}",
+            f"- 技术栈: {tech_stack or '未指定'}",
+            f"- 启动命令: {init_command}",
+        ]
+    )
+
+
+# 会话前检查成功结果缓存：(project_dir, init.sh 摘要) -> (完成时间, 结果)
+# 放在模块级，连续模式下每轮新建的 Agent 实例也能复用
+_PRECHECK_CACHE: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+
+# 子进程输出管道的单次读取大小
+_PIPE_READ_SIZE = 1 << 16
+
+# 终止子进程组后等待输出读取线程结束的时长（秒）
+_READER_JOIN_GRACE_SEC = 1.0
+
+
+def _drain_capped(stream: BinaryIO, cap: int, sink: List[bytes]) -> None:
+    """
+    读取管道直到 EOF，只保留前 cap + 1 字节（多出的 1 字节用于判断是否截断）。
+
+    参数:
+        stream: 子进程的 stdout/stderr 管道
+        cap: 保留字节上限
+        sink: 保留数据块的输出列表
+    """
+    kept = 0
+    try:
+        for chunk in iter(lambda: stream.read1(_PIPE_READ_SIZE), b""):
+            if kept <= cap:
+                chunk = chunk[:cap + 1 - kept]
+                sink.append(chunk)
+                kept += len(chunk)
+    except (OSError, ValueError):
+        pass
+
+
+async def _adrain_capped(stream: asyncio.StreamReader, cap: int) -> bytes:
+    """
+    异步读取管道直到 EOF，只保留前 cap + 1 字节，与 _drain_capped 的截断语义一致。
+
+    参数:
+        stream: 异步子进程的 stdout/stderr 管道
+        cap: 保留字节上限
+
+    返回:
+        bytes: 保留的数据（长度超过 cap 表示输出被截断）
+    """
+    chunks: List[bytes] = []
+    kept = 0
+    while True:
+        chunk = await stream.read(_PIPE_READ_SIZE)
+        if not chunk:
+            break
+        if kept <= cap:
+            chunk = chunk[:cap + 1 - kept]
+            chunks.append(chunk)
+            kept += len(chunk)
+    return b"".join(chunks)
+
+
+def _run_capped(
+    args: List[str], cwd: str, timeout: float, cap: int
+) -> subprocess.CompletedProcess:
+    """
+    执行命令并边读边丢弃超出上限的输出，避免冗长命令占用大量内存。
+
+    参数:
+        args: 命令参数列表
+        cwd: 工作目录
+        timeout: 超时秒数（包含等待输出管道关闭的时间）
+        cap: stdout/stderr 各自保留的字节上限
+
+    返回:
+        subprocess.CompletedProcess: stdout/stderr 为截取后的 bytes
+
+    异常:
+        subprocess.TimeoutExpired: 超时（子进程及其进程组会被终止）
+
+    说明:
+        子进程在独立会话中启动，超时或中断时整组终止，
+        后台孙进程随之退出，读取线程读到 EOF 后两个管道都会被关闭。
+    """
+    proc = subprocess.Popen(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        bufsize=_PIPE_READ_SIZE,
+        start_new_session=True,
+    )
+    stdout_chunks: List[bytes] = []
+    stderr_chunks: List[bytes] = []
+    readers = [
+        threading.Thread(target=_drain_capped, args=(proc.stdout, cap, stdout_chunks), daemon=True),
+        threading.Thread(target=_drain_capped, args=(proc.stderr, cap, stderr_chunks), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    deadline = time.monotonic() + timeout
+    try:
+        proc.wait(timeout=timeout)
+        for reader in readers:
+            reader.join(max(0.0, deadline - time.monotonic()))
+        if any(reader.is_alive() for reader in readers):
+            # 进程已退出但后台子进程仍占用管道，按超时处理
+            raise subprocess.TimeoutExpired(args, timeout)
+    except BaseException:
+        # 超时或被中断（如 KeyboardInterrupt）：终止整个进程组，释放管道写端
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+        proc.wait()
+        raise
+    finally:
+        for reader in readers:
+            reader.join(_READER_JOIN_GRACE_SEC)
+        proc.stdout.close()
+        proc.stderr.close()
+
+    return subprocess.CompletedProcess(
+        args, proc.returncode, b"".join(stdout_chunks), b"".join(stderr_chunks)
+    )
+
+
+class _AgentResources:
+    """
+    CodingAgent 持有的可释放资源（运行日志缓冲与句柄、常驻 Bash、回调线程池、响应缓存）。
+
+    说明:
+        单独成类是为了交给 weakref.finalize：终结回调只引用本对象而不引用 Agent，
+        因此 Agent 不会被全局引用长期固定，被回收或进程退出时都能刷新日志并释放资源。
+    """
+
+    def __init__(self, run_log_path: str):
+        """初始化资源容器，各资源在首次使用时才创建。"""
+        self.run_log_path = run_log_path
+        # 运行日志文件句柄在首次刷新时打开并复用
+        self.run_log_fh: Optional[BinaryIO] = None
+        # 缓冲元素为 (记录时间戳, 记录)，时间格式化与序列化推迟到刷新时
+        self.run_log_buffer: List[Tuple[float, Dict[str, Any]]] = []
+        # 自上次 fsync 以来写入的运行日志条数（配合 RUN_LOG_FSYNC_INTERVAL）
+        self.run_log_unsynced = 0
+        # 常驻 Bash 工作进程（仅在开启 PERSISTENT_BASH_WORKER 时按需创建）
+        self.bash_worker: Optional[PersistentBashWorker] = None
+        # on_iteration 回调在单线程池中按序执行，不阻塞下一轮迭代
+        self.callback_pool: Optional[ThreadPoolExecutor] = None
+        # 模型响应缓存（仅在开启 RESPONSE_CACHE_ENABLED 时创建，只用于回退执行器）
+        self.response_cache: Optional[ResponseCache] = None
+
+    def flush_run_log(self) -> None:
+        """将缓冲的运行日志一次性写入文件，复用已打开的文件句柄，按配置的间隔 fsync。"""
+        if not self.run_log_buffer:
+            return
+
+        try:
+            lines: List[bytes] = []
+            for timestamp, record in self.run_log_buffer:
+                if Config.RUN_LOG_EPOCH_TS:
+                    stamped = {"ts": int(timestamp), **record}
+                else:
+                    stamped = {"timestamp": _format_timestamp(timestamp), **record}
+                try:
+                    lines.append(dumps_json_line(stamped))
+                except Exception:
+                    # 单条记录序列化失败不影响其余记录
+                    continue
+            if self.run_log_fh is None:
+                # 追加模式（O_APPEND）保证多进程并发追加安全，64KB 缓冲聚合小批量写入
+                self.run_log_fh = open(self.run_log_path, "ab", buffering=1 << 16)
+            self.run_log_fh.writelines(lines)
+            self.run_log_fh.flush()
+            fsync_interval = Config.RUN_LOG_FSYNC_INTERVAL
+            if fsync_interval > 0:
+                self.run_log_unsynced += len(lines)
+                if self.run_log_unsynced >= fsync_interval:
+                    os.fsync(self.run_log_fh.fileno())
+                    self.run_log_unsynced = 0
+        except Exception:
+            # 日志写入失败不应阻断主流程
+            pass
+        finally:
+            self.run_log_buffer.clear()
+
+    def release(self) -> None:
+        """等待迭代回调完成、刷新日志并释放全部资源，可重复调用。"""
+        if self.callback_pool is not None:
+            self.callback_pool.shutdown(wait=True)
+            self.callback_pool = None
+        self.flush_run_log()
+        flush_event_log()
+        if self.bash_worker is not None:
+            self.bash_worker.close()
+            self.bash_worker = None
+        if self.response_cache is not None:
+            self.response_cache.close()
+            self.response_cache = None
+        if self.run_log_fh is not None:
+            try:
+                self.run_log_fh.close()
+            except Exception:
+                pass
+            self.run_log_fh = None
 
 
 class CodingAgent:
@@ -120,6 +624,15 @@ class CodingAgent:
     - 记录迭代运行日志
     """
 
+    # 功能状态图标与优先级中文标签（供待办列表格式化使用）
+    _STATUS_ICONS = {
+        "pending": "⏳",
+        "in_progress": "🔄",
+        "completed": "✅",
+        "blocked": "❌",
+    }
+    _PRIORITY_LABELS = {"high": "高", "medium": "中", "low": "低"}
+
     def __init__(
         self,
         project_dir: str,
@@ -130,7 +643,12 @@ class CodingAgent:
         """初始化 CodingAgent 及其依赖组件。"""
         self.project_dir = os.path.abspath(project_dir)
         set_project_dir(self.project_dir)
-        os.makedirs(self.project_dir, exist_ok=True)
+        # 目录通常已存在（连续模式每轮都会新建实例），先用一次 stat 判断，省去 mkdir 失败再 stat
+        if not os.path.isdir(self.project_dir):
+            os.makedirs(self.project_dir, exist_ok=True)
+        # 项目内固定文件路径在实例生命周期内不变，构造时计算一次
+        self._init_script_path = os.path.join(self.project_dir, Config.INIT_SCRIPT_NAME)
+        self._run_log_path_cached = os.path.join(self.project_dir, Config.RUN_LOG_FILE)
 
         # 若外部尚未初始化事件日志器，则使用默认配置兜底
         if get_event_logger() is None:
@@ -158,15 +676,41 @@ class CodingAgent:
             temperature if temperature is not None else Config.TEMPERATURE
         )
 
-        self.llm: Optional[ChatOpenAI] = None
+        self.llm: Optional["ChatOpenAI"] = None
         self.tools: List[Any] = []
         self.agent_executor: Optional[Any] = None
+        self._system_prompt: str = ""
+        self._system_message: Optional[SystemMessage] = None
         self._fallback_executor: Optional[SimpleAgentExecutor] = None
         self._use_langgraph = False
 
         self._iteration_count = 0
         self._last_action: Optional[str] = None
 
+        # 已标准化的对话历史（追加式），避免每次调用都重新标准化全部历史
+        self._session_history = _IncrementalHistory()
+        # LangGraph 输入消息缓冲：[系统消息] + 会话历史，只追加新增历史；
+        # 调用时临时追加本轮用户消息，结束后弹出
+        self._message_buffer: List[Any] = []
+
+        # 运行日志缓冲、常驻 Bash、回调线程池与响应缓存集中在资源容器中；
+        # 终结回调只引用容器，实例被回收或进程退出时都会刷新日志并释放资源
+        self._resources = _AgentResources(self._run_log_path_cached)
+        self._finalizer = weakref.finalize(self, self._resources.release)
+        # 串行化同一实例上的 run/initialize/chat/close（可重入：run_continuous 内部会调用 run）
+        self._run_lock = threading.RLock()
+        self._run_log_deadline = 0.0
+        # init.sh 内容缓存：((mtime_ns, size), content)，文件未修改时复用
+        self._init_sh_cache: Optional[Tuple[Tuple[int, int], str]] = None
+        # 验收命令缓存：feature_id -> 命令列表（每轮开始时清空）
+        self._verify_commands_cache: Dict[str, List[str]] = {}
+        # 本实例是否已确认 .gitignore 包含运行日志忽略规则
+        self._gitignore_checked = False
+        # 本实例是否已确认响应缓存文件被忽略且未被 Git 跟踪
+        self._response_cache_ignored = False
+        # init.sh 压缩结果缓存：(原文, 压缩结果)；原文来自 mtime 缓存，未修改时为同一对象
+        self._init_sh_compress_cache: Optional[Tuple[str, str]] = None
+
         self._init_llm()
         self._init_tools()
         self._init_agent()
@@ -174,7 +718,9 @@ class CodingAgent:
         self._init_git_helper()
 
     def _init_llm(self) -> None:
-        """初始化 ChatOpenAI 客户端。"""
+        """初始化 ChatOpenAI 客户端（langchain_openai 在此处才导入，避免拖慢 CLI 启动）。"""
+        from langchain_openai import ChatOpenAI
+
         self.llm = ChatOpenAI(
             model=self.model_name,
             base_url=self.base_url,
@@ -183,15 +729,36 @@ class CodingAgent:
             max_tokens=Config.MAX_TOKENS,
         )
 
+    def _open_response_cache(self) -> Optional[ResponseCache]:
+        """
+        按配置打开模型响应缓存
+
+        返回:
+            Optional[ResponseCache]: 未启用或温度过高（输出本应随机）时返回 None
+        """
+        if not Config.RESPONSE_CACHE_ENABLED or self.temperature > Config.RESPONSE_CACHE_MAX_TEMPERATURE:
+            return None
+        self._resources.response_cache = ResponseCache(
+            os.path.join(self.project_dir, Config.RESPONSE_CACHE_FILE),
+            ttl_sec=Config.RESPONSE_CACHE_TTL_SEC,
+        )
+        return self._resources.response_cache
+
     def _init_tools(self) -> None:
         """加载可供 Agent 调用的工具列表。"""
         self.tools = get_all_tools()
 
     def _init_agent(self) -> None:
         """初始化 Agent 执行器并按可用能力选择运行模式。"""
-        self._fallback_executor = SimpleAgentExecutor(self.llm, self.tools)
+        # 系统提示词在会话内保持不变，只解析一次
+        self._system_prompt = get_system_prompt()
+        self._system_message = _build_system_message(self._system_prompt)
+        self._fallback_executor = SimpleAgentExecutor(
+            self.llm, self.tools, self._system_prompt, response_cache=self._open_response_cache()
+        )
 
-        if not LANGGRAPH_AVAILABLE:
+        create_react_agent = _load_create_react_agent()
+        if create_react_agent is None:
             self.agent_executor = self._fallback_executor
             self._use_langgraph = False
             return
@@ -215,21 +782,11 @@ class CodingAgent:
     @staticmethod
     def _extract_langgraph_output(result: Any) -> str:
         """从 LangGraph 调用结果中提取最终文本输出。"""
-        if result is None:
-            return ""
-
-        if isinstance(result, str):
-            return result
-
+        extractor = _OUTPUT_EXTRACTORS.get(type(result))
+        if extractor is not None:
+            return extractor(result)
         if isinstance(result, dict):
-            if "output" in result:
-                return str(result.get("output", ""))
-            messages = result.get("messages", [])
-            if isinstance(messages, list) and messages:
-                last_msg = messages[-1]
-                return str(getattr(last_msg, "content", str(last_msg)))
-            return str(result)
-
+            return _extract_output_from_dict(result)
         return str(result)
 
     @staticmethod
@@ -256,16 +813,21 @@ class CodingAgent:
         head_part = "\n".join(lines[:30]).strip()
 
         # 以二级标题切分，优先保留最近几个章节（通常包含最新执行结果与问题）。
-        blocks = progress_content.split("\n## ")
+        # 在同一次 splitlines 结果上按标题行下标切片，不再重复扫描全文。
+        starts = [0] + [index for index, line in enumerate(lines) if index and line.startswith("## ")]
+        ends = starts[1:] + [len(lines)]
         normalized_blocks: List[str] = []
-        for index, block in enumerate(blocks):
-            block = block.strip()
-            if not block:
-                continue
-            if index == 0:
-                normalized_blocks.append(block)
+        for start, end in zip(starts, ends):
+            block = "\n".join(lines[start:end])
+            if start:
+                # 标题行去掉 "## " 后再整体 strip，与按 "\n## " 切分的结果保持一致
+                block = block[3:].strip()
+                if block:
+                    normalized_blocks.append("## " + block)
             else:
-                normalized_blocks.append("## " + block)
+                block = block.strip()
+                if block:
+                    normalized_blocks.append(block)
 
         tail_count = max(1, Config.CONTEXT_RECENT_PROGRESS_SECTIONS)
         recent_blocks = normalized_blocks[-tail_count:]
@@ -306,6 +868,10 @@ class CodingAgent:
         if not init_sh.strip():
             return ""
 
+        cached = self._init_sh_compress_cache
+        if cached is not None and cached[0] == init_sh:
+            return cached[1]
+
         lines = init_sh.splitlines()
         max_lines = max(1, Config.CONTEXT_INIT_MAX_LINES)
         preview_lines = lines[:max_lines]
@@ -313,51 +879,88 @@ class CodingAgent:
         if len(lines) > max_lines:
             preview += "\n# ...(已截断)"
 
-        digest = hashlib.sha1(init_sh.encode("utf-8")).hexdigest()[:12]
+        digest = hashlib.blake2b(init_sh.encode("utf-8"), digest_size=6).hexdigest()
         preview = self._truncate_text(preview, Config.CONTEXT_INIT_MAX_CHARS)
-        return (
+        result = (
             f"- 总行数: {len(lines)}\n"
-            f"- SHA1: {digest}\n"
+            f"- BLAKE2b: {digest}\n"
             "```bash\n"
             f"{preview}\n"
             "```"
         )
+        self._init_sh_compress_cache = (init_sh, result)
+        return result
 
     @property
     def _run_log_path(self) -> str:
         """获取迭代日志文件路径。"""
-        return os.path.join(self.project_dir, Config.RUN_LOG_FILE)
+        return self._run_log_path_cached
 
     def _append_run_log(self, record: Dict[str, Any]) -> None:
-        """将一次迭代记录追加写入 JSONL 日志文件。"""
-        try:
-            with open(self._run_log_path, "a", encoding="utf-8") as file_obj:
-                file_obj.write(json.dumps(record, ensure_ascii=False) + "\n")
-        except Exception:
-            # 日志写入失败不应阻断主流程
-            pass
+        """
+        将一次迭代记录写入缓冲区，按条数或停留时间批量追加到 JSONL 日志文件。
+
+        说明:
+            记录的 timestamp 字段在此自动补充。条数达到 RUN_LOG_BUFFER_SIZE，
+            或最早的缓冲记录已超过 RUN_LOG_FLUSH_INTERVAL_SEC 时触发刷新；
+            此外 run() 结束时总会刷新，记录最多停留到本轮结束。
+        """
+        buffer = self._resources.run_log_buffer
+        now = time.monotonic()
+        if not buffer:
+            self._run_log_deadline = now + Config.RUN_LOG_FLUSH_INTERVAL_SEC
+        buffer.append((time.time(), record))
+
+        if (
+            len(buffer) >= Config.RUN_LOG_BUFFER_SIZE
+            or now >= self._run_log_deadline
+        ):
+            self._flush_run_log()
+
+    def _flush_run_log(self) -> None:
+        """将缓冲的运行日志一次性写入文件（见 _AgentResources.flush_run_log）。"""
+        self._resources.flush_run_log()
+
+    @_serialized
+    def close(self) -> None:
+        """刷新运行日志与事件日志、等待迭代回调完成、释放文件句柄与响应缓存并停止常驻 Bash 进程，可重复调用。"""
+        self._resources.release()
 
     def _runtime_log_files(self) -> List[str]:
         """返回需要长期忽略 Git 跟踪的运行日志文件名列表。"""
-        return [Config.EVENT_LOG_FILE, Config.RUN_LOG_FILE]
+        files = [Config.EVENT_LOG_FILE, Config.RUN_LOG_FILE]
+        if Config.RESPONSE_CACHE_ENABLED:
+            files.append(Config.RESPONSE_CACHE_FILE)
+        return files
 
     def _ensure_runtime_logs_ignored(self) -> None:
-        """确保目标项目 .gitignore 包含运行日志忽略规则。"""
+        """
+        确保目标项目 .gitignore 包含运行日志忽略规则
+
+        说明:
+            仅当缺少规则时才写文件；确认完成后本实例不再重复读取 .gitignore。
+        """
+        if self._gitignore_checked:
+            return
+
         gitignore_path = os.path.join(self.project_dir, ".gitignore")
         required_entries = self._runtime_log_files()
 
         existing_lines: List[str] = []
-        if os.path.exists(gitignore_path):
+        try:
             with open(gitignore_path, "r", encoding="utf-8") as file_obj:
                 existing_lines = file_obj.read().splitlines()
+        except FileNotFoundError:
+            pass
 
         normalized = {
-            line.strip()
-            for line in existing_lines
-            if line.strip() and not line.strip().startswith("#")
+            stripped
+            for stripped in (line.strip() for line in existing_lines)
+            if stripped and not stripped.startswith("#")
         }
         missing_entries = [entry for entry in required_entries if entry not in normalized]
         if not missing_entries:
+            self._gitignore_checked = True
             emit_event(
                 event_type="git_status",
                 component="git",
@@ -374,8 +977,12 @@ class CodingAgent:
         output_lines.append("# Agent runtime logs")
         output_lines.extend(missing_entries)
         output_content = "\n".join(output_lines) + "\n"
-        with open(gitignore_path, "w", encoding="utf-8") as file_obj:
+        # 先写临时文件再原子替换，避免写入中断留下残缺的 .gitignore
+        tmp_path = gitignore_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file_obj:
             file_obj.write(output_content)
+        os.replace(tmp_path, gitignore_path)
+        self._gitignore_checked = True
 
         emit_event(
             event_type="git_status",
@@ -390,6 +997,20 @@ class CodingAgent:
             phase="init",
         )
 
+    def _ensure_response_cache_ignored(self) -> None:
+        """
+        开启响应缓存时确保缓存文件已加入 .gitignore 且未被 Git 跟踪
+
+        说明:
+            忽略规则通常在 initialize() 中写入；对已初始化的项目再开启缓存时，
+            需在本轮自动提交（git add -A）之前补齐，避免 SQLite 文件被逐轮提交。
+        """
+        if self._response_cache_ignored or self._resources.response_cache is None:
+            return
+        self._ensure_runtime_logs_ignored()
+        self._untrack_runtime_logs_if_needed()
+        self._response_cache_ignored = True
+
     def _untrack_runtime_logs_if_needed(self) -> None:
         """若运行日志已被 Git 跟踪，则取消跟踪并保留本地文件。"""
         if not self.git_helper.is_repo():
@@ -403,25 +1024,21 @@ class CodingAgent:
             )
             return
 
-        runtime_logs = self._runtime_log_files()
-        ls_result = subprocess.run(
-            ["git", "ls-files", "--"] + runtime_logs,
-            cwd=self.project_dir,
-            capture_output=True,
-            text=True,
-        )
-        if ls_result.returncode != 0:
+        ok, tracked_files, error = self.git_helper.untrack_files(self._runtime_log_files())
+        if not ok:
+            payload: Dict[str, Any] = {"message": error}
+            if tracked_files:
+                payload["files"] = tracked_files
             emit_event(
                 event_type="error",
                 component="git",
                 name="untrack_runtime_logs",
-                payload={"message": ls_result.stderr.strip()},
+                payload=payload,
                 ok=False,
                 phase="init",
             )
             return
 
-        tracked_files = [line.strip() for line in ls_result.stdout.splitlines() if line.strip()]
         if not tracked_files:
             emit_event(
                 event_type="git_status",
@@ -433,23 +1050,6 @@ class CodingAgent:
             )
             return
 
-        untrack_result = subprocess.run(
-            ["git", "rm", "--cached", "--ignore-unmatch", "--"] + tracked_files,
-            cwd=self.project_dir,
-            capture_output=True,
-            text=True,
-        )
-        if untrack_result.returncode != 0:
-            emit_event(
-                event_type="error",
-                component="git",
-                name="untrack_runtime_logs",
-                payload={"message": untrack_result.stderr.strip(), "files": tracked_files},
-                ok=False,
-                phase="init",
-            )
-            return
-
         emit_event(
             event_type="git_status",
             component="git",
@@ -461,7 +1061,7 @@ class CodingAgent:
 
     def _build_scaffold_init_summary(self, project_name: str, requirements: str) -> str:
         """生成 scaffold-only 模式的初始化摘要并写入 progress.md。"""
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now = now_str()
         requirement_preview = self._truncate_text(requirements.strip(), 500)
         summary_lines = [
             "## 初始化分析（scaffold-only）",
@@ -483,8 +1083,23 @@ class CodingAgent:
         ]
         return "\n".join(summary_lines)
 
-    def _execute_validated_command(self, command: str, timeout: int) -> Dict[str, Any]:
-        """执行经过安全校验的命令并返回结构化结果。"""
+    def _get_bash_worker(self) -> PersistentBashWorker:
+        """获取（必要时创建）项目目录下的常驻 Bash 工作进程。"""
+        resources = self._resources
+        if resources.bash_worker is None:
+            resources.bash_worker = PersistentBashWorker(self.project_dir)
+        return resources.bash_worker
+
+    def _prepare_command(
+        self, command: str, start_time: float
+    ) -> Tuple[Optional[Dict[str, Any]], List[str], str]:
+        """
+        记录命令调用事件、执行安全校验并解析执行参数。
+
+        返回:
+            Tuple[Optional[Dict[str, Any]], List[str], str]:
+                (提前结束时的结果, 执行参数, 执行模式)；结果非空表示无需再执行
+        """
         emit_event(
             event_type="tool_use",
             component="agent",
@@ -497,167 +1112,191 @@ class CodingAgent:
         validator = get_validator()
         check_result = validator.validate_with_compound_handling(command)
         if not check_result.allowed:
-            rejected = {
-                "ok": False,
-                "command": command,
-                "returncode": 126,
-                "stdout": "",
-                "stderr": check_result.reason,
-                "mode": "rejected",
-                "duration_sec": 0.0,
-            }
-            emit_event(
-                event_type="tool_result",
-                component="agent",
-                name="command_exec",
-                payload={
-                    "status": "blocked",
-                    "returncode": rejected["returncode"],
-                    "duration_sec": rejected["duration_sec"],
-                    "stderr_preview": rejected["stderr"],
-                },
-                ok=False,
-                iteration=self._iteration_count,
-                phase="run",
+            rejected = self._build_command_result(
+                command, 126, "", check_result.reason, "rejected", start_time
             )
-            return rejected
+            rejected["duration_sec"] = 0.0
+            return self._finish_command(rejected, status="blocked"), [], "rejected"
 
-        start_time = time.time()
         try:
-            if _is_compound_shell_command(command):
+            if check_result.is_compound:
                 # 复合命令使用 bash -lc 解释执行，但不启用 shell=True
                 exec_args = ["bash", "-lc", command]
                 mode = "compound"
             else:
                 # 单命令模式使用 shlex 拆分参数，避免注入风险
-                exec_args = shlex.split(command)
+                exec_args = list(split_command(command))
                 mode = "single"
+        except ValueError as exc:
+            invalid = self._build_command_result(
+                command, 2, "", f"命令解析失败: {exc}", "invalid", start_time
+            )
+            return self._finish_command(invalid), [], "invalid"
 
-            if not exec_args:
-                return {
-                    "ok": False,
-                    "command": command,
-                    "returncode": 2,
-                    "stdout": "",
-                    "stderr": "命令为空",
-                    "mode": "invalid",
-                    "duration_sec": round(time.time() - start_time, 3),
-                }
+        if not exec_args:
+            invalid = self._build_command_result(command, 2, "", "命令为空", "invalid", start_time)
+            return self._finish_command(invalid), [], "invalid"
 
-            completed = subprocess.run(
-                exec_args,
-                shell=False,
-                cwd=self.project_dir,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-            )
+        return None, exec_args, mode
 
-            success = {
-                "ok": completed.returncode == 0,
-                "command": command,
-                "returncode": completed.returncode,
-                "stdout": completed.stdout,
-                "stderr": completed.stderr,
-                "mode": mode,
-                "duration_sec": round(time.time() - start_time, 3),
-            }
-            emit_event(
-                event_type="tool_result",
-                component="agent",
-                name="command_exec",
-                payload={
-                    "status": "done" if success["ok"] else "error",
-                    "returncode": success["returncode"],
-                    "duration_sec": success["duration_sec"],
-                    "stdout_preview": self._truncate_text(success["stdout"], 200),
-                    "stderr_preview": self._truncate_text(success["stderr"], 200),
-                },
-                ok=success["ok"],
-                iteration=self._iteration_count,
-                phase="run",
-            )
-            return success
+    @staticmethod
+    def _decode_output(data: Any) -> str:
+        """
+        解码命令输出，只保留前 COMMAND_OUTPUT_CAP_BYTES 字节。
 
-        except subprocess.TimeoutExpired:
-            timeout_result = {
-                "ok": False,
-                "command": command,
-                "returncode": 124,
-                "stdout": "",
-                "stderr": f"命令执行超时（{timeout}秒）",
-                "mode": "timeout",
-                "duration_sec": round(time.time() - start_time, 3),
-            }
-            emit_event(
-                event_type="tool_result",
-                component="agent",
-                name="command_exec",
-                payload={
-                    "status": "error",
-                    "returncode": timeout_result["returncode"],
-                    "duration_sec": timeout_result["duration_sec"],
-                    "stderr_preview": timeout_result["stderr"],
-                },
-                ok=False,
-                iteration=self._iteration_count,
-                phase="run",
+        参数:
+            data: 子进程输出（bytes；常驻 bash 返回的是 str）
+
+        返回:
+            str: 解码后的文本，超出上限时附加截断标记
+        """
+        cap = Config.COMMAND_OUTPUT_CAP_BYTES
+        if isinstance(data, str):
+            return data if len(data) <= cap else data[:cap] + "\n...(已截断)"
+        if not data:
+            return ""
+        text = data[:cap].decode("utf-8", errors="replace")
+        return text if len(data) <= cap else text + "\n...(已截断)"
+
+    @staticmethod
+    def _build_command_result(
+        command: str,
+        returncode: int,
+        stdout: str,
+        stderr: str,
+        mode: str,
+        start_time: float,
+    ) -> Dict[str, Any]:
+        """构建统一的命令执行结果结构。"""
+        return {
+            "ok": returncode == 0,
+            "command": command,
+            "returncode": returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+            "mode": mode,
+            "duration_sec": round(time.time() - start_time, 3),
+        }
+
+    def _finish_command(self, result: Dict[str, Any], status: Optional[str] = None) -> Dict[str, Any]:
+        """发送命令结果事件并原样返回结果。"""
+        payload: Dict[str, Any] = {
+            "status": status or ("done" if result["ok"] else "error"),
+            "returncode": result["returncode"],
+            "duration_sec": result["duration_sec"],
+        }
+        if result["mode"] in {"single", "compound"}:
+            payload["stdout_preview"] = self._truncate_text(result["stdout"], 200)
+        payload["stderr_preview"] = self._truncate_text(result["stderr"], 200)
+        emit_event(
+            event_type="tool_result",
+            component="agent",
+            name="command_exec",
+            payload=payload,
+            ok=result["ok"],
+            iteration=self._iteration_count,
+            phase="run",
+        )
+        return result
+
+    def _execute_validated_command(self, command: str, timeout: int) -> Dict[str, Any]:
+        """执行经过安全校验的命令并返回结构化结果。"""
+        start_time = time.time()
+        early_result, exec_args, mode = self._prepare_command(command, start_time)
+        if early_result is not None:
+            return early_result
+
+        try:
+            if mode == "compound" and Config.PERSISTENT_BASH_WORKER:
+                # 复用常驻 bash，省去每条命令的进程创建与 profile 加载
+                completed = self._get_bash_worker().run(
+                    command, timeout, output_cap=Config.COMMAND_OUTPUT_CAP_BYTES
+                )
+            else:
+                completed = _run_capped(
+                    exec_args, self.project_dir, timeout, Config.COMMAND_OUTPUT_CAP_BYTES
+                )
+            result = self._build_command_result(
+                command,
+                completed.returncode,
+                self._decode_output(completed.stdout),
+                self._decode_output(completed.stderr),
+                mode,
+                start_time,
             )
-            return timeout_result
-        except ValueError as exc:
-            invalid = {
-                "ok": False,
-                "command": command,
-                "returncode": 2,
-                "stdout": "",
-                "stderr": f"命令解析失败: {exc}",
-                "mode": "invalid",
-                "duration_sec": round(time.time() - start_time, 3),
-            }
-            emit_event(
-                event_type="tool_result",
-                component="agent",
-                name="command_exec",
-                payload={
-                    "status": "error",
-                    "returncode": invalid["returncode"],
-                    "duration_sec": invalid["duration_sec"],
-                    "stderr_preview": invalid["stderr"],
-                },
-                ok=False,
-                iteration=self._iteration_count,
-                phase="run",
+        except subprocess.TimeoutExpired:
+            result = self._build_command_result(
+                command, 124, "", f"命令执行超时（{timeout}秒）", "timeout", start_time
             )
-            return invalid
         except Exception as exc:
-            failed = {
-                "ok": False,
-                "command": command,
-                "returncode": 1,
-                "stdout": "",
-                "stderr": str(exc),
-                "mode": "error",
-                "duration_sec": round(time.time() - start_time, 3),
-            }
-            emit_event(
-                event_type="tool_result",
-                component="agent",
-                name="command_exec",
-                payload={
-                    "status": "error",
-                    "returncode": failed["returncode"],
-                    "duration_sec": failed["duration_sec"],
-                    "stderr_preview": failed["stderr"],
-                },
-                ok=False,
-                iteration=self._iteration_count,
-                phase="run",
+            result = self._build_command_result(command, 1, "", str(exc), "error", start_time)
+
+        return self._finish_command(result)
+
+    async def _execute_validated_command_async(self, command: str, timeout: int) -> Dict[str, Any]:
+        """
+        异步执行经过安全校验的命令（用于并发验收）。
+
+        任务被取消时会终止对应子进程，保证快速失败不遗留后台命令。
+        """
+        start_time = time.time()
+        early_result, exec_args, mode = self._prepare_command(command, start_time)
+        if early_result is not None:
+            return early_result
+
+        process: Optional[asyncio.subprocess.Process] = None
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *exec_args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.project_dir,
             )
-            return failed
+            # 边读边丢弃超出上限的输出，与同步路径 _run_capped 保持相同的内存上限
+            cap = Config.COMMAND_OUTPUT_CAP_BYTES
+            stdout, stderr, _ = await asyncio.wait_for(
+                asyncio.gather(
+                    _adrain_capped(process.stdout, cap),
+                    _adrain_capped(process.stderr, cap),
+                    process.wait(),
+                ),
+                timeout=timeout,
+            )
+            result = self._build_command_result(
+                command,
+                process.returncode,
+                self._decode_output(stdout),
+                self._decode_output(stderr),
+                mode,
+                start_time,
+            )
+        except asyncio.TimeoutError:
+            await self._kill_process(process)
+            result = self._build_command_result(
+                command, 124, "", f"命令执行超时（{timeout}秒）", "timeout", start_time
+            )
+        except asyncio.CancelledError:
+            await self._kill_process(process)
+            raise
+        except Exception as exc:
+            result = self._build_command_result(command, 1, "", str(exc), "error", start_time)
+
+        return self._finish_command(result)
+
+    @staticmethod
+    async def _kill_process(process: Optional[asyncio.subprocess.Process]) -> None:
+        """终止仍在运行的异步子进程并等待其回收。"""
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
 
     def _ensure_init_script(self) -> None:
         """确保项目目录存在最小可用的 init.sh 脚本。"""
-        init_path = os.path.join(self.project_dir, Config.INIT_SCRIPT_NAME)
+        init_path = self._init_script_path
         if os.path.exists(init_path):
             emit_event(
                 event_type="precheck",
@@ -688,9 +1327,36 @@ echo \"[init.sh] 初始化检查通过\"
             phase="init",
         )
 
+    def _read_init_script(self) -> str:
+        """
+        读取 init.sh 内容，按 (修改时间纳秒, 文件大小) 缓存。
+
+        返回:
+            str: 脚本内容，不存在或读取失败时返回空字符串
+        """
+        init_path = self._init_script_path
+        try:
+            stat_result = os.stat(init_path)
+        except OSError:
+            self._init_sh_cache = None
+            return ""
+
+        # 文件大小一并作为键，粗粒度 mtime 的文件系统上同一时刻内的改写也能被发现
+        key = (stat_result.st_mtime_ns, stat_result.st_size)
+        if self._init_sh_cache is not None and self._init_sh_cache[0] == key:
+            return self._init_sh_cache[1]
+
+        try:
+            with open(init_path, "r", encoding="utf-8") as file_obj:
+                content = file_obj.read()
+        except Exception:
+            return ""
+        self._init_sh_cache = (key, content)
+        return content
+
     def _run_session_precheck(self) -> Dict[str, Any]:
         """执行会话前检查（优先运行 init.sh）。"""
-        init_path = os.path.join(self.project_dir, Config.INIT_SCRIPT_NAME)
+        init_path = self._init_script_path
         if not os.path.exists(init_path):
             skipped = {
                 "ok": True,
@@ -708,11 +1374,34 @@ echo \"[init.sh] 初始化检查通过\"
             )
             return skipped
 
+        digest = hashlib.blake2b(
+            self._read_init_script().encode("utf-8"), digest_size=16
+        ).hexdigest()
+        cache_key = (self.project_dir, digest)
+        cached = _PRECHECK_CACHE.get(cache_key)
+        if cached is not None and time.time() - cached[0] < Config.PRECHECK_TTL_SEC:
+            result = dict(cached[1])
+            result["cached"] = True
+            emit_event(
+                event_type="precheck",
+                component="agent",
+                name="session_precheck",
+                payload={"message": "init.sh 未变化，复用上次成功的会话前检查结果"},
+                ok=True,
+                iteration=self._iteration_count,
+                phase="run",
+            )
+            return result
+
         result = self._execute_validated_command(
             command=f"bash ./{Config.INIT_SCRIPT_NAME}",
             timeout=Config.SESSION_PRECHECK_TIMEOUT,
         )
         result["skipped"] = False
+        if result.get("ok"):
+            _PRECHECK_CACHE[cache_key] = (time.time(), dict(result))
+        else:
+            _PRECHECK_CACHE.pop(cache_key, None)
         emit_event(
             event_type="precheck",
             component="agent",
@@ -739,9 +1428,81 @@ echo \"[init.sh] 初始化检查通过\"
 
         return []
 
+    def _feature_verify_commands_cached(self, feature: Feature) -> List[str]:
+        """
+        按功能 ID 缓存验收命令列表。
+
+        说明:
+            同一轮迭代中任务描述与验收执行会各取一次命令；
+            缓存在每轮开始以及新增、重置功能时清空。
+        """
+        commands = self._verify_commands_cache.get(feature.id)
+        if commands is None:
+            commands = self._get_feature_verify_commands(feature)
+            self._verify_commands_cache[feature.id] = commands
+        return commands
+
+    def _run_verify_commands_serial(
+        self, commands: List[str]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """按顺序执行验收命令，遇到首个失败即停止。"""
+        command_results: List[Dict[str, Any]] = []
+        for command in commands:
+            result = self._execute_validated_command(
+                command=command,
+                timeout=Config.VERIFICATION_TIMEOUT,
+            )
+            command_results.append(result)
+            if not result.get("ok"):
+                return command_results, command
+        return command_results, None
+
+    def _run_verify_commands_parallel(
+        self, commands: List[str]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        并发执行相互独立的验收命令。
+
+        首个失败出现后取消并终止其余命令；返回结果按原命令顺序排列，
+        仅包含已完成的命令。
+        """
+        return _run_coroutine_sync(self._run_verify_commands_async(commands))
+
+    async def _run_verify_commands_async(
+        self, commands: List[str]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """使用 asyncio 子进程并发执行验收命令，遇到失败即快速结束。"""
+        tasks = [
+            asyncio.ensure_future(
+                self._execute_validated_command_async(command, Config.VERIFICATION_TIMEOUT)
+            )
+            for command in commands
+        ]
+        index_of = {task: index for index, task in enumerate(tasks)}
+        results_by_index: Dict[int, Dict[str, Any]] = {}
+        failed_command: Optional[str] = None
+
+        pending = set(tasks)
+        while pending and failed_command is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = index_of[task]
+                result = task.result()
+                results_by_index[index] = result
+                if not result.get("ok") and failed_command is None:
+                    failed_command = commands[index]
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        command_results = [results_by_index[index] for index in sorted(results_by_index)]
+        return command_results, failed_command
+
     def _run_feature_verification(self, feature: Feature) -> Dict[str, Any]:
         """执行功能验收命令并返回验证结果。"""
-        commands = self._get_feature_verify_commands(feature)
+        commands = self._feature_verify_commands_cached(feature)
         if not commands:
             no_verify = {
                 "passed": False,
@@ -759,33 +1520,34 @@ echo \"[init.sh] 初始化检查通过\"
             )
             return no_verify
 
-        command_results: List[Dict[str, Any]] = []
-        for command in commands:
-            result = self._execute_validated_command(
-                command=command,
-                timeout=Config.VERIFICATION_TIMEOUT,
+        parallel = feature.verify_commands_parallel
+        if parallel is None:
+            parallel = Config.PARALLEL_VERIFY
+        if parallel and len(commands) > 1:
+            command_results, failed_command = self._run_verify_commands_parallel(commands)
+        else:
+            command_results, failed_command = self._run_verify_commands_serial(commands)
+
+        if failed_command is not None:
+            failed = {
+                "passed": False,
+                "reason": f"验收失败: {failed_command}",
+                "results": command_results,
+            }
+            emit_event(
+                event_type="verification",
+                component="agent",
+                name="feature_verification",
+                payload={
+                    "feature_id": feature.id,
+                    "reason": failed["reason"],
+                    "commands": commands,
+                },
+                ok=False,
+                iteration=self._iteration_count,
+                phase="run",
             )
-            command_results.append(result)
-            if not result.get("ok"):
-                failed = {
-                    "passed": False,
-                    "reason": f"验收失败: {command}",
-                    "results": command_results,
-                }
-                emit_event(
-                    event_type="verification",
-                    component="agent",
-                    name="feature_verification",
-                    payload={
-                        "feature_id": feature.id,
-                        "reason": failed["reason"],
-                        "commands": commands,
-                    },
-                    ok=False,
-                    iteration=self._iteration_count,
-                    phase="run",
-                )
-                return failed
+            return failed
 
         verification_ok = {
             "passed": True,
@@ -807,17 +1569,84 @@ echo \"[init.sh] 初始化检查通过\"
         )
         return verification_ok
 
+    def _sync_session_messages(self, history: List[Any]) -> List[Any]:
+        """将外部对话历史增量同步到会话消息缓冲区，返回标准化后的消息列表。"""
+        return self._session_history.sync(history)
+
+    def _sync_message_buffer(self, history: List[Any]) -> List[Any]:
+        """
+        使 LangGraph 消息缓冲与标准化历史保持一致。
+
+        参数:
+            history: `_sync_session_messages` 返回的标准化历史
+
+        返回:
+            List[Any]: [系统消息] + 历史 的缓冲列表（调用方临时追加后需弹出）
+
+        说明:
+            历史只追加时仅扩展新增部分；历史被重建或系统消息变化时整体重建。
+        """
+        buffer = self._message_buffer
+        synced = len(buffer) - 1
+        if (
+            synced < 0
+            or buffer[0] is not self._system_message
+            or synced > len(history)
+            or (synced and buffer[synced] is not history[synced - 1])
+        ):
+            buffer[:] = [self._system_message]
+            synced = 0
+        if len(history) > synced:
+            buffer.extend(history[synced:])
+        return buffer
+
+    def _stream_langgraph(self, inputs: Dict[str, Any]) -> Any:
+        """
+        以流式方式运行 LangGraph 执行器。
+
+        参数:
+            inputs: 执行器输入（包含 messages）
+
+        返回:
+            Any: 最后一个状态快照，结构与 invoke() 的返回值一致
+
+        说明:
+            每当状态中出现新的助手文本时立即发出 assistant_text 事件，
+            无需等待整条工具调用链结束。
+        """
+        final_state: Any = None
+        seen_messages = len(inputs.get("messages", []))
+        for state in self.agent_executor.stream(inputs, stream_mode="values"):
+            final_state = state
+            messages = state.get("messages", []) if isinstance(state, dict) else []
+            for message in messages[seen_messages:]:
+                content = getattr(message, "content", "")
+                if isinstance(message, AIMessage) and isinstance(content, str) and content:
+                    emit_event(
+                        event_type="assistant_text",
+                        component="agent",
+                        name="assistant_step",
+                        payload={"text_preview": self._truncate_text(content, 200)},
+                        ok=True,
+                        iteration=self._iteration_count,
+                        phase="run",
+                    )
+            seen_messages = max(seen_messages, len(messages))
+        return final_state
+
     def _invoke_agent(self, prompt: str, chat_history: Optional[List[Any]] = None) -> Dict[str, Any]:
         """统一封装 Agent 调用，优先 LangGraph，失败回退到简易执行器。"""
-        history = chat_history or []
+        history = self._sync_session_messages(chat_history or [])
         self._last_action = "invoke_agent"
 
         if self._use_langgraph and self.agent_executor is not None:
             try:
-                messages: List[Any] = [SystemMessage(content=get_system_prompt())]
-                messages.extend(SimpleAgentExecutor._normalize_chat_history(history))
+                messages = self._sync_message_buffer(history)
                 messages.append(HumanMessage(content=prompt))
-                result = self.agent_executor.invoke({"messages": messages})
+                try:
+                    result = self._stream_langgraph({"messages": messages})
+                finally:
+                    messages.pop()
                 output_text = self._extract_langgraph_output(result)
                 emit_event(
                     event_type="assistant_text",
@@ -844,6 +1673,82 @@ echo \"[init.sh] 初始化检查通过\"
         )
         return fallback_result
 
+    async def _ainvoke_agent(
+        self, prompt: str, chat_history: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        异步版本的 Agent 调用，供并发批量调用使用。
+
+        说明:
+            历史消息在本次调用内独立标准化，不使用会话消息缓冲区，
+            因此多个调用可以安全地并发执行。
+        """
+        history = SimpleAgentExecutor._normalize_chat_history(chat_history or [])
+
+        if self._use_langgraph and self.agent_executor is not None:
+            try:
+                messages: List[Any] = [self._system_message]
+                messages.extend(history)
+                messages.append(HumanMessage(content=prompt))
+                result = await self.agent_executor.ainvoke({"messages": messages})
+                output_text = self._extract_langgraph_output(result)
+                emit_event(
+                    event_type="assistant_text",
+                    component="agent",
+                    name="assistant_response",
+                    payload={"text_preview": self._truncate_text(output_text, 500)},
+                    ok=True,
+                    iteration=self._iteration_count,
+                    phase="run",
+                )
+                return {"output": output_text}
+            except Exception:
+                self._use_langgraph = False
+
+        fallback_result = await self._fallback_executor.ainvoke(
+            {"input": prompt, "chat_history": history}
+        )
+        emit_event(
+            event_type="assistant_text",
+            component="agent",
+            name="assistant_response",
+            payload={"text_preview": self._truncate_text(fallback_result.get("output", ""), 500)},
+            ok=True,
+            iteration=self._iteration_count,
+            phase="run",
+        )
+        return fallback_result
+
+    async def ainvoke_many(self, prompts: List[str]) -> List[Dict[str, Any]]:
+        """
+        并发执行多条相互独立的提示词。
+
+        参数:
+            prompts: 提示词列表（不携带对话历史）
+
+        返回:
+            List[Dict[str, Any]]: 与输入顺序一致的结果列表；
+            单条失败时对应位置为 {"output": "", "error": 错误信息}
+
+        说明:
+            并发数受 Config.MAX_CONCURRENT_LLM 限制。
+        """
+        semaphore = asyncio.Semaphore(max(1, Config.MAX_CONCURRENT_LLM))
+
+        async def _bounded(prompt: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self._ainvoke_agent(prompt)
+                except Exception as exc:
+                    return {"output": "", "error": str(exc)}
+
+        return list(await asyncio.gather(*(_bounded(prompt) for prompt in prompts)))
+
+    def invoke_many(self, prompts: List[str]) -> List[Dict[str, Any]]:
+        """ainvoke_many() 的同步包装，供非异步调用方使用。"""
+        return _run_coroutine_sync(self.ainvoke_many(prompts))
+
+    @_serialized
     def initialize(
         self,
         requirements: str,
@@ -851,6 +1756,8 @@ echo \"[init.sh] 初始化检查通过\"
         init_mode: str = "scaffold-only",
     ) -> bool:
         """初始化项目进度文件、基础结构和初始 Git 提交。"""
+        # 工具与安全校验读取进程级项目目录；实例可能被复用（见 create_agent），每次入口都重新指向本项目
+        set_project_dir(self.project_dir)
         normalized_mode = (init_mode or "scaffold-only").strip().lower()
         if normalized_mode not in {"scaffold-only", "open"}:
             normalized_mode = "scaffold-only"
@@ -901,7 +1808,7 @@ echo \"[init.sh] 初始化检查通过\"
                         requirements=requirements,
                         project_name=project_name,
                         project_dir=self.project_dir,
-                        current_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        current_time=now_str(),
                         init_mode=normalized_mode,
                     )
                     init_result = self._invoke_agent(init_prompt, [])
@@ -929,14 +1836,20 @@ echo \"[init.sh] 初始化检查通过\"
                     phase="init",
                 )
 
-            if self.git_helper.has_changes():
-                self.git_helper.commit("chore: 项目初始化")
+            # 暂存、比对与提交合并为一次调用，None 表示没有可提交的变更
+            init_commit_ok = self.git_helper.commit_if_changes("chore: 项目初始化")
+            if init_commit_ok is not None:
                 emit_event(
-                    event_type="git_commit",
+                    event_type="git_commit" if init_commit_ok else "error",
                     component="git",
                     name="initialize_commit",
-                    payload={"message": "chore: 项目初始化", "init_mode": normalized_mode},
-                    ok=True,
+                    payload={
+                        "message": (
+                            "chore: 项目初始化" if init_commit_ok else "提交失败: chore: 项目初始化"
+                        ),
+                        "init_mode": normalized_mode,
+                    },
+                    ok=init_commit_ok,
                     phase="init",
                 )
 
@@ -961,12 +1874,28 @@ echo \"[init.sh] 初始化检查通过\"
             )
             return False
 
+    @_serialized
     def run(
         self,
         max_iterations: Optional[int] = None,
-        on_iteration: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+        on_iteration: Optional[Callable[[int, Mapping[str, Any]], None]] = None,
     ) -> Dict[str, Any]:
         """执行单次任务循环并处理一个可执行功能。"""
+        set_project_dir(self.project_dir)
+        self._ensure_response_cache_ignored()
+        try:
+            return self._run_once(max_iterations, on_iteration)
+        finally:
+            # 本轮记录在轮次结束时必定落盘，不会滞留到下一轮（可能是数分钟后）才刷新
+            self._flush_run_log()
+
+    def _run_once(
+        self,
+        max_iterations: Optional[int] = None,
+        on_iteration: Optional[Callable[[int, Mapping[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """单次任务循环的具体实现。"""
+        self._verify_commands_cache.clear()
         update_event_context(phase="run", project_dir=self.project_dir)
         emit_event(
             event_type="session_start",
@@ -1068,7 +1997,6 @@ echo \"[init.sh] 初始化检查通过\"
             }
             self._append_run_log(
                 {
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     "iteration": self._iteration_count,
                     "event": "session_precheck_failed",
                     "payload": payload,
@@ -1133,14 +2061,7 @@ echo \"[init.sh] 初始化检查通过\"
 
         progress_content = self.progress_manager.load_progress() or ""
         git_history = format_commits_for_prompt(self.git_helper.get_recent_commits(5))
-        init_sh_path = os.path.join(self.project_dir, Config.INIT_SCRIPT_NAME)
-        init_sh_content = ""
-        if os.path.exists(init_sh_path):
-            try:
-                with open(init_sh_path, "r", encoding="utf-8") as file_obj:
-                    init_sh_content = file_obj.read()
-            except Exception:
-                init_sh_content = ""
+        init_sh_content = self._read_init_script()
 
         session_context = self._build_session_context(
             progress_content=progress_content,
@@ -1164,7 +2085,7 @@ echo \"[init.sh] 初始化检查通过\"
             verification = self._run_feature_verification(next_feature)
             is_completed = verification.get("passed", False)
 
-            now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            now_text = now_str()
             run_status = "completed" if is_completed else "in_progress"
             if is_completed:
                 self.progress_manager.record_feature_attempt(
@@ -1175,7 +2096,7 @@ echo \"[init.sh] 初始化检查通过\"
                 self.progress_manager.update_feature_status(
                     next_feature.id,
                     "completed",
-                    f"完成于 {now_str}；{verification.get('reason', '')}",
+                    f"完成于 {now_text}；{verification.get('reason', '')}",
                 )
                 summary_title = "## 功能执行记录（完成）"
             else:
@@ -1195,7 +2116,7 @@ echo \"[init.sh] 初始化检查通过\"
                         next_feature.id,
                         "blocked",
                         (
-                            f"会话结束于 {now_str}；{verification.get('reason', '验收未通过')}"
+                            f"会话结束于 {now_text}；{verification.get('reason', '验收未通过')}"
                             f"；连续失败 {fail_count} 次，已转 blocked"
                         ),
                     )
@@ -1205,34 +2126,36 @@ echo \"[init.sh] 初始化检查通过\"
                         next_feature.id,
                         "in_progress",
                         (
-                            f"会话结束于 {now_str}；{verification.get('reason', '验收未通过')}"
+                            f"会话结束于 {now_text}；{verification.get('reason', '验收未通过')}"
                             f"；连续失败 {fail_count} 次{cooldown_info}"
                         ),
                     )
                     summary_title = "## 功能执行记录（进行中）"
 
-            verification_lines = ["### 验收结果", f"- 结论: {verification.get('reason', '')}"]
-            for item in verification.get("results", []):
-                verification_lines.append(
-                    f"- 命令: `{item.get('command', '')}`，返回码: {item.get('returncode', '')}"
-                )
-                if item.get("stderr"):
-                    verification_lines.append(f"  - 错误: {self._truncate_text(item['stderr'], 300)}")
-
-            if output_text.strip() or verification_lines:
-                self.progress_manager.append_to_progress(
-                    f"{summary_title}\n\n"
-                    f"- 功能: {next_feature.id} {next_feature.name}\n\n"
-                    f"### Agent 输出\n{self._truncate_text(output_text, 1500)}\n\n"
-                    + "\n".join(verification_lines)
+            # 先按较大上限截断一次，运行日志的短预览从中再截取，避免重复扫描长输出
+            output_preview = self._truncate_text(output_text, 1500)
+            # 验收结果段落始终存在，因此每轮都会写入执行记录
+            self.progress_manager.append_to_progress(
+                "\n".join(
+                    [
+                        summary_title,
+                        "",
+                        f"- 功能: {next_feature.id} {next_feature.name}",
+                        "",
+                        "### Agent 输出",
+                        output_preview,
+                        "",
+                        *self._verification_summary_lines(verification),
+                    ]
                 )
+            )
 
-            if self.git_helper.has_changes():
-                if is_completed:
-                    commit_msg = f"feat: 完成 {next_feature.name} ({next_feature.id})"
-                else:
-                    commit_msg = f"wip: {next_feature.name} 验收未通过 ({next_feature.id})"
-                commit_ok = self.git_helper.commit(commit_msg)
+            if is_completed:
+                commit_msg = f"feat: 完成 {next_feature.name} ({next_feature.id})"
+            else:
+                commit_msg = f"wip: {next_feature.name} 验收未通过 ({next_feature.id})"
+            commit_ok = self.git_helper.commit_if_changes(commit_msg)
+            if commit_ok is not None:
                 if commit_ok:
                     emit_event(
                         event_type="git_commit",
@@ -1271,7 +2194,6 @@ echo \"[init.sh] 初始化检查通过\"
 
             self._append_run_log(
                 {
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     "iteration": self._iteration_count,
                     "event": "run_iteration",
                     "feature_id": next_feature.id,
@@ -1281,12 +2203,23 @@ echo \"[init.sh] 初始化检查通过\"
                         "ok": precheck_result.get("ok", False),
                         "stderr": self._truncate_text(precheck_result.get("stderr", ""), 300),
                     },
-                    "output_preview": self._truncate_text(output_text, 300),
+                    "output_preview": self._truncate_text(output_preview, 300),
                 }
             )
 
             if on_iteration is not None:
-                on_iteration(self._iteration_count, payload)
+                resources = self._resources
+                if resources.callback_pool is None:
+                    resources.callback_pool = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="iteration-callback"
+                    )
+                # 回调异步执行：传入本轮结果的只读深拷贝，返回给调用方的 payload 被修改时不影响回调
+                future = resources.callback_pool.submit(
+                    on_iteration, self._iteration_count, MappingProxyType(copy.deepcopy(payload))
+                )
+                future.add_done_callback(
+                    partial(_report_iteration_callback_error, self._iteration_count)
+                )
             emit_event(
                 event_type="session_end",
                 component="agent",
@@ -1328,7 +2261,6 @@ echo \"[init.sh] 初始化检查通过\"
             }
             self._append_run_log(
                 {
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     "iteration": self._iteration_count,
                     "event": "run_exception",
                     "payload": payload,
@@ -1373,7 +2305,11 @@ echo \"[init.sh] 初始化检查通过\"
             "fatal_errors": [],
         }
 
+        last_failed_feature = ""
+        fail_streak = 0
+
         for iteration_index in range(max_total_iterations):
+            iteration_start = time.monotonic()
             # 对齐 quickstart：每轮都创建全新的 Agent 实例，确保 fresh context
             session_agent = CodingAgent(
                 project_dir=self.project_dir,
@@ -1381,7 +2317,11 @@ echo \"[init.sh] 初始化检查通过\"
                 base_url=self.base_url,
                 temperature=self.temperature,
             )
-            result = session_agent.run(max_iterations=Config.MAX_ITERATIONS)
+            try:
+                result = session_agent.run(max_iterations=Config.MAX_ITERATIONS)
+            finally:
+                # 每轮的 Agent 实例随即丢弃，及时落盘并释放日志句柄
+                session_agent.close()
             results["total_iterations"] += 1
 
             feature_id = result.get("feature_id") or ""
@@ -1390,6 +2330,15 @@ echo \"[init.sh] 初始化检查通过\"
             elif (not result.get("success")) and feature_id:
                 results["failed_features"].append(feature_id)
 
+            if feature_id and not result.get("success") and result.get("status") != "blocked":
+                fail_streak = fail_streak + 1 if feature_id == last_failed_feature else 1
+                last_failed_feature = feature_id
+            else:
+                # 成功，或失败功能已转为 blocked（不再参与调度）：
+                # 其余依赖已满足的功能仍可继续执行，不计入同一功能的连续失败
+                fail_streak = 0
+                last_failed_feature = ""
+
             stop_reason = ""
             # 所有功能完成：正常结束连续模式
             if result.get("success") and result.get("message") == "所有功能已完成":
@@ -1402,6 +2351,12 @@ echo \"[init.sh] 初始化检查通过\"
                 stop_reason = "fatal_error"
                 results["failed_features"].append(f"iteration-{iteration_index + 1}")
                 results["fatal_errors"].append(str(result.get("error")))
+            # 同一功能反复失败：继续循环只会重复消耗模型与验收调用
+            elif (
+                Config.CONTINUOUS_MAX_REPEATED_FAILURES > 0
+                and fail_streak >= Config.CONTINUOUS_MAX_REPEATED_FAILURES
+            ):
+                stop_reason = "repeated_failure"
 
             emit_event(
                 event_type="session_end",
@@ -1412,7 +2367,7 @@ echo \"[init.sh] 初始化检查通过\"
                     "feature_id": feature_id or None,
                     "success": bool(result.get("success")),
                     "status": result.get("status", "unknown"),
-                    "next_sleep_sec": effective_pause,
+                    "max_sleep_sec": effective_pause,
                     "stop_reason": stop_reason or None,
                     "error": result.get("error"),
                 },
@@ -1423,50 +2378,25 @@ echo \"[init.sh] 初始化检查通过\"
             if stop_reason:
                 break
 
-            if effective_pause > 0:
-                time.sleep(effective_pause)
+            # 轮间间隔只用于限制空转频率：本轮耗时已超过间隔则直接继续；
+            # 功能被转为 blocked 时下一轮会换一个功能，同样无需等待
+            remaining_pause = effective_pause - (time.monotonic() - iteration_start)
+            if remaining_pause > 0 and result.get("status") != "blocked":
+                time.sleep(remaining_pause)
 
         return results
 
-    def _build_context(self, progress_content: str, feature_list: Any) -> str:
-        """构建简要上下文摘要。"""
-        stats = self.progress_manager.get_progress_stats()
-        context_parts = [
-            "## 项目信息",
-            f"- 名称: {feature_list.project_name}",
-            f"- 总功能数: {stats['total']}",
-            f"- 已完成: {stats['completed']}",
-            f"- 完成率: {stats['completion_rate']}%",
-            "",
-            "## 当前进度",
-            progress_content or "（无进度记录）",
-        ]
-        return "\n".join(context_parts)
-
     def _format_pending_features(self) -> str:
         """格式化待处理功能列表供提示词使用。"""
         pending = self.progress_manager.get_pending_features()
         if not pending:
             return "（无待完成功能）"
 
-        status_map = {
-            "pending": "⏳",
-            "in_progress": "🔄",
-            "completed": "✅",
-            "blocked": "❌",
-        }
-        priority_map = {"high": "高", "medium": "中", "low": "低"}
-
-        lines: List[str] = []
-        for feature in pending:
-            status_icon = status_map.get(feature.status, "❓")
-            priority = priority_map.get(feature.priority, "中")
-            lines.append(
-                f"{status_icon} [{feature.id}] {feature.name} "
-                f"(优先级: {priority}, 状态: {feature.status})"
-            )
-
-        return "\n".join(lines)
+        return "\n".join(
+            f"{self._STATUS_ICONS.get(feature.status, '❓')} [{feature.id}] {feature.name} "
+            f"(优先级: {self._PRIORITY_LABELS.get(feature.priority, '中')}, 状态: {feature.status})"
+            for feature in pending
+        )
 
     def _build_session_context(
         self,
@@ -1482,75 +2412,78 @@ echo \"[init.sh] 初始化检查通过\"
         compressed_git_history = self._compress_git_history(git_history)
         compressed_init_sh = self._compress_init_script(init_sh)
 
-        context_parts = [
-            "## 会话上下文",
-            "",
-            "### 项目信息",
-            f"- 名称: {feature_list.project_name}",
-            f"- 技术栈: {feature_list.tech_stack or '未指定'}",
-            f"- 启动命令: {feature_list.init_command}",
-            f"- 总功能数: {stats['total']}",
-            f"- 已完成: {stats['completed']}",
-            f"- 完成率: {stats['completion_rate']}%",
-            "",
-            "### 会话前检查",
-        ]
-
         if precheck_result is None:
-            context_parts.append("- 本轮未执行会话前检查")
+            precheck_line = "- 本轮未执行会话前检查"
         elif precheck_result.get("ok"):
-            context_parts.append("- 会话前检查通过")
+            precheck_line = "- 会话前检查通过"
         else:
-            context_parts.append(f"- 会话前检查失败: {precheck_result.get('stderr', '')}")
+            precheck_line = f"- 会话前检查失败: {precheck_result.get('stderr', '')}"
+
+        init_block = (
+            f"\n\n### init.sh 摘要（压缩）\n{compressed_init_sh}" if compressed_init_sh else ""
+        )
 
-        context_parts.extend(
-            [
+        context_text = "\n".join(
+            (
+                _static_project_header(
+                    str(feature_list.project_name),
+                    str(feature_list.tech_stack or ""),
+                    str(feature_list.init_command),
+                ),
+                f"- 总功能数: {stats['total']}",
+                f"- 已完成: {stats['completed']}",
+                f"- 完成率: {stats['completion_rate']}%",
+                "",
+                "### 会话前检查",
+                precheck_line,
                 "",
                 "### 进度文件摘要（压缩）",
                 compressed_progress,
                 "",
                 "### 最近 Git 历史（压缩）",
                 compressed_git_history,
-            ]
-        )
-
-        if compressed_init_sh:
-            context_parts.extend(["", "### init.sh 摘要（压缩）", compressed_init_sh])
-
-        context_text = "\n".join(context_parts)
+            )
+        ) + init_block
         return self._truncate_text(context_text, Config.CONTEXT_TOTAL_MAX_CHARS)
 
+    def _verification_summary_lines(self, verification: Dict[str, Any]) -> List[str]:
+        """生成写入 progress.md 的验收结果段落各行，由调用方与执行记录一起拼接。"""
+        lines = ["### 验收结果", f"- 结论: {verification.get('reason', '')}"]
+        for item in verification.get("results", []):
+            lines.append(
+                f"- 命令: `{item.get('command', '')}`，返回码: {item.get('returncode', '')}"
+            )
+            if item.get("stderr"):
+                lines.append(f"  - 错误: {self._truncate_text(item['stderr'], 300)}")
+        return lines
+
     def _format_current_task(self, feature: Feature) -> str:
         """格式化当前执行任务的描述文本。"""
-        lines = [
-            f"## 当前任务: [{feature.id}] {feature.name}",
-            "",
-            f"**描述**: {feature.description or '无描述'}",
-            "",
-        ]
-
+        criteria_block = ""
         if feature.acceptance_criteria:
-            lines.append("**验收标准**:")
-            for index, criteria in enumerate(feature.acceptance_criteria, 1):
-                lines.append(f"{index}. {criteria}")
-            lines.append("")
+            criteria_lines = "\n".join(
+                f"{index}. {criteria}"
+                for index, criteria in enumerate(feature.acceptance_criteria, 1)
+            )
+            criteria_block = f"**验收标准**:\n{criteria_lines}\n\n"
 
-        verify_commands = self._get_feature_verify_commands(feature)
+        verify_commands = self._feature_verify_commands_cached(feature)
+        verify_block = ""
         if verify_commands:
-            lines.append("**验收命令**:")
-            for index, command in enumerate(verify_commands, 1):
-                lines.append(f"{index}. `{command}`")
-            lines.append("")
-
-        lines.extend(
-            [
-                "**重要提醒**:",
-                "- 完成功能后必须执行验收命令",
-                "- 只有验收通过才允许标记 completed",
-                "- 会话结束前更新进度并创建提交",
-            ]
+            verify_lines = "\n".join(
+                f"{index}. `{command}`" for index, command in enumerate(verify_commands, 1)
+            )
+            verify_block = f"**验收命令**:\n{verify_lines}\n\n"
+
+        return (
+            f"## 当前任务: [{feature.id}] {feature.name}\n\n"
+            f"**描述**: {feature.description or '无描述'}\n\n"
+            f"{criteria_block}{verify_block}"
+            "**重要提醒**:\n"
+            "- 完成功能后必须执行验收命令\n"
+            "- 只有验收通过才允许标记 completed\n"
+            "- 会话结束前更新进度并创建提交"
         )
-        return "\n".join(lines)
 
     def get_status(self) -> Dict[str, Any]:
         """返回当前 Agent 状态、统计信息与下一任务。"""
@@ -1576,8 +2509,10 @@ echo \"[init.sh] 初始化检查通过\"
             "run_log_path": self._run_log_path,
         }
 
+    @_serialized
     def chat(self, message: str, chat_history: Optional[List[Any]] = None) -> str:
         """执行一次对话请求并返回文本回复。"""
+        set_project_dir(self.project_dir)
         result = self._invoke_agent(message, chat_history or [])
         return result.get("output", "")
 
@@ -1591,6 +2526,7 @@ echo \"[init.sh] 初始化检查通过\"
         verify_commands: Optional[List[str]] = None,
     ) -> bool:
         """向功能列表添加新功能项。"""
+        self._verify_commands_cache.pop(feature_id, None)
         return self.progress_manager.add_feature(
             feature_id=feature_id,
             name=name,
@@ -1602,6 +2538,7 @@ echo \"[init.sh] 初始化检查通过\"
 
     def reset_feature(self, feature_id: str) -> bool:
         """将指定功能状态重置为 pending。"""
+        self._verify_commands_cache.pop(feature_id, None)
         return self.progress_manager.update_feature_status(
             feature_id=feature_id,
             status="pending",
@@ -1609,23 +2546,83 @@ echo \"[init.sh] 初始化检查通过\"
         )
 
 
+# 进程级 Agent 注册表：(项目绝对路径, 模型名, 服务地址) -> CodingAgent
+# 同一进程内重复调用 create_agent/quick_init/quick_run 时复用实例，避免重复初始化；
+# 按最近使用顺序保留，超过上限时淘汰最久未用的实例并关闭其资源
+_AGENT_REGISTRY: "OrderedDict[Tuple[str, Optional[str], Optional[str]], CodingAgent]" = OrderedDict()
+_AGENT_REGISTRY_LOCK = threading.Lock()
+_AGENT_REGISTRY_MAX = 8
+
+
 def create_agent(
     project_dir: str,
     model_name: Optional[str] = None,
     base_url: Optional[str] = None,
 ) -> CodingAgent:
-    """创建 CodingAgent 实例的工厂函数。"""
-    return CodingAgent(project_dir=project_dir, model_name=model_name, base_url=base_url)
+    """
+    创建或复用 CodingAgent 实例的工厂函数。
+
+    参数:
+        project_dir: 项目目录
+        model_name: 模型名称（可选）
+        base_url: 模型服务地址（可选）
+
+    返回:
+        CodingAgent: 同一进程内相同参数对应的共享实例
+
+    说明:
+        run()/initialize() 每次都会强制重新加载 feature_list.json，
+        复用实例不会读到过期的功能状态；需要全新实例时先调用 invalidate_agent()。
+        共享实例的 run/initialize/chat 在实例锁下串行执行，可被多个线程同时调用。
+        注册表最多保留 _AGENT_REGISTRY_MAX 个实例，被淘汰的实例会先关闭
+        （等待其进行中的调用结束）；调用方仍持有时可继续使用，资源会按需重新创建。
+    """
+    key = (os.path.abspath(project_dir), model_name, base_url)
+    evicted: List[CodingAgent] = []
+    with _AGENT_REGISTRY_LOCK:
+        agent = _AGENT_REGISTRY.get(key)
+        if agent is None:
+            agent = CodingAgent(project_dir=project_dir, model_name=model_name, base_url=base_url)
+            _AGENT_REGISTRY[key] = agent
+            while len(_AGENT_REGISTRY) > _AGENT_REGISTRY_MAX:
+                evicted.append(_AGENT_REGISTRY.popitem(last=False)[1])
+        else:
+            _AGENT_REGISTRY.move_to_end(key)
+            # 命中时不会经过 __init__，需重新指向本项目，保持与新建实例一致
+            set_project_dir(agent.project_dir)
+    # 关闭会等待实例锁，放在注册表锁之外，避免阻塞其他项目的 create_agent
+    for old_agent in evicted:
+        old_agent.close()
+    return agent
+
+
+def invalidate_agent(project_dir: str) -> int:
+    """
+    移除并关闭指定项目目录下的所有共享 Agent 实例。
+
+    参数:
+        project_dir: 项目目录
+
+    返回:
+        int: 被移除的实例数量
+    """
+    abs_dir = os.path.abspath(project_dir)
+    with _AGENT_REGISTRY_LOCK:
+        keys = [key for key in _AGENT_REGISTRY if key[0] == abs_dir]
+        agents = [_AGENT_REGISTRY.pop(key) for key in keys]
+    for agent in agents:
+        agent.close()
+    return len(agents)
 
 
 def quick_init(project_dir: str, requirements: str) -> CodingAgent:
     """快速完成 Agent 创建与项目初始化。"""
-    agent = CodingAgent(project_dir)
+    agent = create_agent(project_dir)
     agent.initialize(requirements)
     return agent
 
 
 def quick_run(project_dir: str) -> Dict[str, Any]:
     """快速创建 Agent 并执行一次任务循环。"""
-    agent = CodingAgent(project_dir)
+    agent = create_agent(project_dir)
     return agent.run()
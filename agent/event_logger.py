@@ -7,15 +7,178 @@
 - 在终端输出中文前缀的详细事件日志
 - 将事件以 JSONL 格式写入项目目录
 - 在不影响主流程的前提下提升可观测性
+
+JSONL 落盘由后台线程批量完成，`emit` 只负责入队；
+进程退出时会通过 atexit 自动刷新剩余事件。
 """
 
+import atexit
 import json
 import os
-from datetime import datetime
-from typing import Any, Dict, Optional
+import queue
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 from config import Config
 
+# 可选使用 orjson 加速 JSONL 序列化，未安装时回退到标准库 json
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# 最近一次格式化的时间戳缓存：(整数秒, 文本)，整体替换元组保证线程安全
+_last_timestamp: Tuple[int, str] = (-1, "")
+
+
+def now_str() -> str:
+    """
+    返回当前本地时间的 "%Y-%m-%d %H:%M:%S" 文本。
+
+    说明:
+        同一秒内的多次调用复用已格式化的字符串，省去重复的 strftime。
+    """
+    global _last_timestamp
+    seconds = int(time.time())
+    cached = _last_timestamp
+    if cached[0] != seconds:
+        cached = (seconds, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds)))
+        _last_timestamp = cached
+    return cached[1]
+
+
+def dumps_json_line(record: Dict[str, Any]) -> bytes:
+    """
+    将记录序列化为以换行结尾的 UTF-8 JSON 行。
+
+    参数:
+        record: 待序列化的字典
+
+    返回:
+        bytes: 可直接以二进制追加写入 JSONL 文件的字节串
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            # orjson 不支持的值（如超过 64 位的整数）交给标准库处理
+            pass
+    # 紧凑分隔符与 orjson 输出格式保持一致，也减少写入体积
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# 载荷中需要脱敏的键名关键字（不区分大小写，子串匹配）
+_SENSITIVE_KEY_WORDS = ("token", "password", "secret", "api_key")
+
+
+@lru_cache(maxsize=1024)
+def _is_sensitive_key(key: str) -> bool:
+    """判断载荷键名是否需要脱敏；键名集合很小，结果按键缓存。"""
+    key_lower = key.lower()
+    return any(word in key_lower for word in _SENSITIVE_KEY_WORDS)
+
+
+# 后台写入队列：元素为 (文件路径, 事件记录列表)
+_EVENT_QUEUE: "queue.Queue[Tuple[str, List[Dict[str, Any]]]]" = queue.Queue(maxsize=10000)
+# 单批次最多合并写入的事件数
+_EVENT_BATCH_SIZE = 256
+# 取到首个事件后继续等待后续事件的时间窗口（秒），把连续的小事件合并为一次写入
+_EVENT_BATCH_WINDOW_SEC = 0.01
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+
+def _append_lines(path: str, lines: List[bytes]) -> None:
+    """将多行 JSONL 一次性追加写入文件，失败时静默忽略。"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as file_obj:
+            file_obj.write(b"".join(lines))
+    except Exception:
+        # 事件日志写入失败不能影响主流程
+        return
+
+
+def _writer_loop() -> None:
+    """后台线程：按数量或时间窗口批量取出事件，按文件分组序列化并写入。"""
+    while True:
+        batch = [_EVENT_QUEUE.get()]
+        deadline = time.monotonic() + _EVENT_BATCH_WINDOW_SEC
+        while len(batch) < _EVENT_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(_EVENT_QUEUE.get(timeout=remaining))
+                else:
+                    batch.append(_EVENT_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+
+        grouped: Dict[str, List[bytes]] = {}
+        for path, records in batch:
+            lines = grouped.setdefault(path, [])
+            for record in records:
+                try:
+                    lines.append(dumps_json_line(record))
+                except Exception:
+                    continue
+        for path, lines in grouped.items():
+            _append_lines(path, lines)
+
+        for _ in batch:
+            _EVENT_QUEUE.task_done()
+
+
+def _ensure_writer_thread() -> None:
+    """按需启动后台写入线程。"""
+    global _writer_thread
+    if _writer_thread is not None and _writer_thread.is_alive():
+        return
+    with _writer_lock:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            _writer_thread = threading.Thread(
+                target=_writer_loop, name="event-log-writer", daemon=True
+            )
+            _writer_thread.start()
+
+
+def flush_event_log(timeout: float = 5.0) -> None:
+    """
+    等待后台线程写完已入队的事件。
+
+    参数:
+        timeout: 最长等待秒数，避免退出阶段被卡住
+    """
+    deadline = time.monotonic() + timeout
+    while _EVENT_QUEUE.unfinished_tasks and time.monotonic() < deadline:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            return
+        time.sleep(0.01)
+
+
+atexit.register(flush_event_log)
+
+
+def _enqueue_records(path: str, records: List[Dict[str, Any]]) -> None:
+    """将一组事件记录作为单个队列元素交给后台线程。"""
+    _ensure_writer_thread()
+    try:
+        _EVENT_QUEUE.put_nowait((path, records))
+    except queue.Full:
+        # 队列积压时退化为同步写入，保证事件不丢失
+        lines: List[bytes] = []
+        for record in records:
+            try:
+                lines.append(dumps_json_line(record))
+            except Exception:
+                continue
+        _append_lines(path, lines)
+
 
 class EventLogger:
     """
@@ -42,7 +205,7 @@ class EventLogger:
     @staticmethod
     def _generate_session_id(phase: str) -> str:
         """生成会话唯一标识。"""
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        timestamp = time.strftime("%Y%m%d%H%M%S")
         return f"{phase}-{timestamp}"
 
     @property
@@ -74,6 +237,11 @@ class EventLogger:
             return text
         return text[:max_len] + "...(已截断)"
 
+    @property
+    def enabled(self) -> bool:
+        """事件是否会被输出到终端或落盘。"""
+        return self.verbose_events or (self.persist_file and bool(self.project_dir))
+
     def _sanitize_payload(self, payload: Any) -> Any:
         """对事件载荷进行基础脱敏与截断。"""
         if payload is None:
@@ -82,8 +250,7 @@ class EventLogger:
         if isinstance(payload, dict):
             sanitized: Dict[str, Any] = {}
             for key, value in payload.items():
-                key_lower = str(key).lower()
-                if any(word in key_lower for word in ["token", "password", "secret", "api_key"]):
+                if _is_sensitive_key(str(key)):
                     sanitized[key] = "***"
                 else:
                     sanitized[key] = self._sanitize_payload(value)
@@ -156,7 +323,7 @@ class EventLogger:
         return f"{prefix} {message}"
 
     def _write_file_event(self, record: Dict[str, Any]) -> None:
-        """将事件记录追加写入 JSONL 文件。"""
+        """将事件记录交给后台线程追加写入 JSONL 文件。"""
         if not self.persist_file:
             return
 
@@ -164,13 +331,7 @@ class EventLogger:
         if not event_path:
             return
 
-        try:
-            os.makedirs(os.path.dirname(event_path), exist_ok=True)
-            with open(event_path, "a", encoding="utf-8") as file_obj:
-                file_obj.write(json.dumps(record, ensure_ascii=False) + "\n")
-        except Exception:
-            # 事件日志写入失败不能影响主流程
-            return
+        _enqueue_records(event_path, [record])
 
     def emit(
         self,
@@ -181,13 +342,26 @@ class EventLogger:
         ok: bool = True,
         iteration: int = 0,
         phase: Optional[str] = None,
-    ) -> Dict[str, Any]:
-        """发送事件日志到终端并落盘。"""
+    ) -> Optional[Dict[str, Any]]:
+        """
+        发送事件日志到终端并落盘
+
+        返回:
+            Optional[Dict[str, Any]]: 已写入队列的事件记录；终端与文件日志均关闭
+            （enabled 为 False）时不构造记录，返回 None
+
+        说明:
+            与 emit_event() 的返回约定一致（未设置全局日志器时同样返回 None）。
+            仓库内调用方均不使用返回值；需要读取记录的调用方应先判断 None。
+        """
+        if not self.enabled:
+            return None
+
         current_phase = phase or self.phase
         safe_payload = self._sanitize_payload(payload or {})
 
         record = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": now_str(),
             "session_id": self.session_id,
             "iteration": iteration,
             "phase": current_phase,
@@ -28,8 +28,16 @@ Git 辅助模块 (git_helper.py)
 
 import os
 import subprocess
-from typing import List, Dict, Optional
-from datetime import datetime
+import time
+from typing import List, Dict, Optional, Tuple
+
+# 可选依赖：pygit2 直接操作索引，省去 git 子进程（未安装时回退 git 命令行）
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    pygit2 = None
+    PYGIT2_AVAILABLE = False
 
 
 class GitHelper:
@@ -68,6 +76,29 @@ class GitHelper:
             project_dir: 项目目录路径
         """
         self.project_dir = os.path.abspath(project_dir)
+        self._repo = None  # pygit2 仓库对象（首次使用时打开并复用）
+
+    def _open_pygit2_repo(self):
+        """
+        打开并缓存 pygit2 仓库对象
+
+        返回:
+            pygit2.Repository 或 None（未安装 pygit2、非仓库或打开失败）
+        """
+        if not PYGIT2_AVAILABLE:
+            return None
+        if self._repo is None:
+            try:
+                repo_path = pygit2.discover_repository(self.project_dir)
+                if repo_path is None:
+                    return None
+                repo = pygit2.Repository(repo_path)
+                if repo.is_bare:
+                    return None
+                self._repo = repo
+            except Exception:
+                return None
+        return self._repo
 
     def _run_git_command(
         self,
@@ -276,7 +307,41 @@ Thumbs.db
             self.add_all()
 
         # 添加时间戳
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        full_message = f"{message}\n\n时间: {timestamp}"
+
+        result = self._run_git_command(["commit", "-m", full_message])
+        if result.returncode != 0:
+            print(f"提交失败: {result.stderr}")
+            return False
+
+        return True
+
+    def commit_if_changes(self, message: str) -> Optional[bool]:
+        """
+        暂存全部变更并在有内容时提交
+
+        参数:
+            message: 提交信息
+
+        返回:
+            Optional[bool]: True 表示已提交，False 表示提交失败，
+            None 表示没有可提交的变更（或目录不是 Git 仓库）
+
+        说明:
+            与先调用 has_changes() 再调用 commit() 相比，只需执行
+            add、diff --cached、commit 三条 git 命令。
+            提交信息同样会自动添加时间戳。
+        """
+        # 非 Git 仓库时 add 会失败，按“无变更”处理，与 has_changes() 的行为一致
+        if self._run_git_command(["add", "-A"]).returncode != 0:
+            return None
+
+        # --quiet 模式下返回码 0 表示暂存区与 HEAD 一致
+        if self._run_git_command(["diff", "--cached", "--quiet"]).returncode == 0:
+            return None
+
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         full_message = f"{message}\n\n时间: {timestamp}"
 
         result = self._run_git_command(["commit", "-m", full_message])
@@ -286,6 +351,55 @@ Thumbs.db
 
         return True
 
+    def untrack_files(self, paths: List[str]) -> Tuple[bool, List[str], str]:
+        """
+        从索引中移除已跟踪的文件，保留工作区文件（等价于 git rm --cached）
+
+        参数:
+            paths: 相对项目目录的文件路径列表
+
+        返回:
+            Tuple[bool, List[str], str]: (是否成功, 实际取消跟踪的文件, 错误信息)
+
+        说明:
+            安装了 pygit2 时直接查询并修改内存中的索引，只写回一次；
+            否则（或 pygit2 操作失败时）回退到 git ls-files + git rm --cached。
+        """
+        repo = self._open_pygit2_repo()
+        if repo is not None:
+            try:
+                index = repo.index
+                index.read()
+                workdir = repo.workdir
+                tracked_files = []
+                for path in paths:
+                    entry_path = os.path.relpath(
+                        os.path.join(self.project_dir, path), workdir
+                    ).replace(os.sep, "/")
+                    if entry_path in index:
+                        index.remove(entry_path)
+                        tracked_files.append(path)
+                if tracked_files:
+                    index.write()
+                return True, tracked_files, ""
+            except Exception:
+                pass
+
+        ls_result = self._run_git_command(["ls-files", "--"] + paths)
+        if ls_result.returncode != 0:
+            return False, [], ls_result.stderr.strip()
+
+        tracked_files = [line.strip() for line in ls_result.stdout.splitlines() if line.strip()]
+        if not tracked_files:
+            return True, [], ""
+
+        untrack_result = self._run_git_command(
+            ["rm", "--cached", "--ignore-unmatch", "--"] + tracked_files
+        )
+        if untrack_result.returncode != 0:
+            return False, tracked_files, untrack_result.stderr.strip()
+        return True, tracked_files, ""
+
     def get_recent_commits(self, count: int = 10) -> List[Dict[str, str]]:
         """
         获取最近的提交历史
@@ -21,10 +21,13 @@
 
 import os
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 
+from .event_logger import now_str
+
 
 # ============================================
 # 数据类定义
@@ -44,6 +47,7 @@ class Feature:
         acceptance_criteria: 验收标准列表（用于自验证）
         test_command: 测试命令（用于验证功能）
         verify_commands: 验收命令列表（支持多个命令按顺序执行）
+        verify_commands_parallel: 验收命令是否并发执行（None 表示沿用 Config.PARALLEL_VERIFY）
         priority: 优先级（high/medium/low）
         status: 状态（pending/in_progress/completed/blocked）
         dependencies: 依赖的其他功能 ID 列表
@@ -61,6 +65,7 @@ class Feature:
     acceptance_criteria: List[str] = None  # 验收标准
     test_command: str = ""  # 测试命令
     verify_commands: List[str] = None  # 验收命令列表
+    verify_commands_parallel: Optional[bool] = None  # 验收命令是否并发执行
     priority: str = "medium"
     status: str = "pending"
     dependencies: List[str] = None
@@ -79,7 +84,7 @@ class Feature:
         设置默认时间戳和空列表。
         """
         if not self.created_at:
-            self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.created_at = now_str()
         if not self.updated_at:
             self.updated_at = self.created_at
         if self.dependencies is None:
@@ -122,6 +127,7 @@ class Feature:
             acceptance_criteria=data.get("acceptance_criteria", []),
             test_command=data.get("test_command", ""),
             verify_commands=data.get("verify_commands", []),
+            verify_commands_parallel=data.get("verify_commands_parallel"),
             priority=data.get("priority", "medium"),
             status=data.get("status", "pending"),
             dependencies=data.get("dependencies", []),
@@ -162,7 +168,7 @@ class FeatureList:
         初始化后处理
         """
         if not self.created_at:
-            self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.created_at = now_str()
         if not self.updated_at:
             self.updated_at = self.created_at
         if self.features is None:
@@ -253,7 +259,7 @@ class ProgressManager:
         返回:
             str: 格式化时间
         """
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return now_str()
 
     @staticmethod
     def _parse_time(time_str: str) -> Optional[datetime]:
@@ -285,6 +291,10 @@ class ProgressManager:
         """
         self.project_dir = os.path.abspath(project_dir)
         self._feature_list: Optional[FeatureList] = None
+        # 统计信息缓存，功能列表重新加载或保存时失效
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        # progress.md 内容缓存：((mtime_ns, size), content)，文件未修改时复用
+        self._progress_cache: Optional[Tuple[Tuple[int, int], str]] = None
 
     @property
     def progress_file_path(self) -> str:
@@ -356,7 +366,7 @@ class ProgressManager:
         返回:
             str: 进度文件内容
         """
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now = now_str()
         return f"""# 项目进度
 
 ## 项目信息
@@ -414,13 +424,12 @@ class ProgressManager:
         返回:
             bool: 是否成功
         """
+        self._stats_cache = None
         try:
             if self._feature_list is None:
                 return False
 
-            self._feature_list.updated_at = datetime.now().strftime(
-                "%Y-%m-%d %H:%M:%S"
-            )
+            self._feature_list.updated_at = now_str()
 
             with open(self.feature_list_path, 'w', encoding='utf-8') as f:
                 json.dump(
@@ -461,6 +470,7 @@ class ProgressManager:
                 data = json.load(f)
 
             self._feature_list = FeatureList.from_dict(data)
+            self._stats_cache = None
             return self._feature_list
 
         except Exception as e:
@@ -473,13 +483,25 @@ class ProgressManager:
 
         返回:
             Optional[str]: 进度文件内容，失败返回 None
+
+        说明:
+            按 (修改时间纳秒, 文件大小) 缓存内容，文件未被改写时不重复读取。
         """
         try:
-            if not os.path.exists(self.progress_file_path):
+            try:
+                stat_result = os.stat(self.progress_file_path)
+            except FileNotFoundError:
+                self._progress_cache = None
                 return None
 
+            key = (stat_result.st_mtime_ns, stat_result.st_size)
+            if self._progress_cache is not None and self._progress_cache[0] == key:
+                return self._progress_cache[1]
+
             with open(self.progress_file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+                content = f.read()
+            self._progress_cache = (key, content)
+            return content
 
         except Exception as e:
             print(f"加载进度文件失败: {str(e)}")
@@ -492,7 +514,8 @@ class ProgressManager:
         description: str = "",
         priority: str = "medium",
         dependencies: List[str] = None,
-        verify_commands: List[str] = None
+        verify_commands: List[str] = None,
+        verify_commands_parallel: Optional[bool] = None
     ) -> bool:
         """
         添加新功能
@@ -504,6 +527,7 @@ class ProgressManager:
             priority: 优先级（high/medium/low）
             dependencies: 依赖的其他功能 ID 列表
             verify_commands: 验收命令列表（可选）
+            verify_commands_parallel: 验收命令是否并发执行（可选，默认沿用全局配置）
 
         返回:
             bool: 是否成功添加
@@ -528,7 +552,8 @@ class ProgressManager:
                 description=description,
                 priority=priority,
                 dependencies=dependencies or [],
-                verify_commands=verify_commands or []
+                verify_commands=verify_commands or [],
+                verify_commands_parallel=verify_commands_parallel
             )
 
             feature_list.features.append(new_feature)
@@ -566,9 +591,7 @@ class ProgressManager:
             for feature in feature_list.features:
                 if feature.id == feature_id:
                     feature.status = status
-                    feature.updated_at = datetime.now().strftime(
-                        "%Y-%m-%d %H:%M:%S"
-                    )
+                    feature.updated_at = now_str()
                     if notes:
                         feature.notes = notes
                     break
@@ -606,15 +629,15 @@ class ProgressManager:
                 return None
 
             updated_feature: Optional[Feature] = None
-            now_str = self._now_str()
+            now_text = self._now_str()
 
             for feature in feature_list.features:
                 if feature.id != feature_id:
                     continue
 
                 feature.attempt_count = int(feature.attempt_count or 0) + 1
-                feature.last_attempt_at = now_str
-                feature.updated_at = now_str
+                feature.last_attempt_at = now_text
+                feature.updated_at = now_text
 
                 if success:
                     feature.consecutive_failures = 0
@@ -622,8 +645,9 @@ class ProgressManager:
                 else:
                     feature.consecutive_failures = int(feature.consecutive_failures or 0) + 1
                     if cooldown_seconds > 0:
-                        cooldown_at = datetime.now() + timedelta(seconds=cooldown_seconds)
-                        feature.cooldown_until = cooldown_at.strftime("%Y-%m-%d %H:%M:%S")
+                        feature.cooldown_until = time.strftime(
+                            "%Y-%m-%d %H:%M:%S", time.localtime(time.time() + cooldown_seconds)
+                        )
                     else:
                         feature.cooldown_until = ""
 
@@ -650,6 +674,7 @@ class ProgressManager:
             应调用此方法清除缓存，以确保后续读取最新数据。
         """
         self._feature_list = None
+        self._stats_cache = None
 
     def get_feature(self, feature_id: str) -> Optional[Feature]:
         """
@@ -720,13 +745,20 @@ class ProgressManager:
         """
         pending = self.get_pending_features()
 
+        # 一次线性扫描建立 id -> 状态索引，依赖检查无需逐个遍历功能列表
+        feature_list = self.load_feature_list()
+        status_by_id = (
+            {f.id: f.status for f in feature_list.features}
+            if feature_list is not None else {}
+        )
+
         in_progress_ready: List[Feature] = []
         pending_ready: List[Feature] = []
         dependency_blocked: List[Dict[str, Any]] = []
         cooldown_blocked: List[Dict[str, Any]] = []
 
         for feature in pending:
-            if not self._check_dependencies(feature):
+            if not self._check_dependencies(feature, status_by_id):
                 dependency_blocked.append(
                     {
                         "id": feature.id,
@@ -787,12 +819,17 @@ class ProgressManager:
             return False
         return datetime.now() < cooldown_until
 
-    def _check_dependencies(self, feature: Feature) -> bool:
+    def _check_dependencies(
+        self,
+        feature: Feature,
+        status_by_id: Optional[Dict[str, str]] = None,
+    ) -> bool:
         """
         检查功能的依赖是否都已完成
 
         参数:
             feature: 要检查的功能
+            status_by_id: 预先构建的 id -> 状态索引（可选，批量检查时传入）
 
         返回:
             bool: 依赖是否都已完成
@@ -800,6 +837,12 @@ class ProgressManager:
         if not feature.dependencies:
             return True
 
+        if status_by_id is not None:
+            return all(
+                status_by_id.get(dep_id) == "completed"
+                for dep_id in feature.dependencies
+            )
+
         feature_list = self.load_feature_list()
         if feature_list is None:
             return False
@@ -820,6 +863,7 @@ class ProgressManager:
 
         说明:
             返回包含总数、完成数、进行中数等待的统计信息。
+            结果会缓存到功能列表下次重新加载或保存为止，返回副本避免调用方修改缓存。
         """
         feature_list = self.load_feature_list()
         if feature_list is None:
@@ -832,22 +876,24 @@ class ProgressManager:
                 "completion_rate": 0.0
             }
 
-        total = len(feature_list.features)
-        completed = sum(1 for f in feature_list.features if f.status == "completed")
-        in_progress = sum(1 for f in feature_list.features if f.status == "in_progress")
-        pending = sum(1 for f in feature_list.features if f.status == "pending")
-        blocked = sum(1 for f in feature_list.features if f.status == "blocked")
-
-        completion_rate = (completed / total * 100) if total > 0 else 0.0
+        if self._stats_cache is None:
+            counts = {"completed": 0, "in_progress": 0, "pending": 0, "blocked": 0}
+            for feature in feature_list.features:
+                if feature.status in counts:
+                    counts[feature.status] += 1
+
+            total = len(feature_list.features)
+            completion_rate = (counts["completed"] / total * 100) if total > 0 else 0.0
+            self._stats_cache = {
+                "total": total,
+                "completed": counts["completed"],
+                "in_progress": counts["in_progress"],
+                "pending": counts["pending"],
+                "blocked": counts["blocked"],
+                "completion_rate": round(completion_rate, 1)
+            }
 
-        return {
-            "total": total,
-            "completed": completed,
-            "in_progress": in_progress,
-            "pending": pending,
-            "blocked": blocked,
-            "completion_rate": round(completion_rate, 1)
-        }
+        return dict(self._stats_cache)
 
     def get_progress_report(self) -> str:
         """
@@ -863,7 +909,7 @@ class ProgressManager:
             "# 项目进度报告",
             "",
             f"**项目名称**: {feature_list.project_name if feature_list else '未知'}",
-            f"**更新时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"**更新时间**: {now_str()}",
             "",
             "## 统计信息",
             "",
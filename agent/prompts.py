@@ -23,8 +23,8 @@
 """
 
 import os
+import time
 from typing import Optional
-from datetime import datetime
 
 
 # ============================================
@@ -195,7 +195,7 @@ class PromptLoader:
         template = self._load_prompt("initializer")
 
         if current_time is None:
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            current_time = time.strftime("%Y-%m-%d %H:%M:%S")
 
         return self._format_prompt(
             template,
@@ -522,7 +522,7 @@ class PromptTemplates:
         说明:
             用于在提示词中插入时间信息。
         """
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return time.strftime("%Y-%m-%d %H:%M:%S")
 
 
 # 创建全局模板实例（向后兼容）
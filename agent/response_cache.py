@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+模型响应缓存模块 (response_cache.py)
+===================================
+
+本模块提供基于 SQLite 的模型响应缓存，用于：
+- 以 (模型, 温度, 完整消息列表) 的 SHA-256 作为内容寻址键
+- 命中时直接返回上次的输出，省去一次网络往返与推理
+- 按有效期清理过期条目
+
+说明:
+    仅适用于不调用工具的纯文本调用（SimpleAgentExecutor）。
+    LangGraph Agent 的输出伴随工具调用的副作用（写文件、执行命令），
+    直接复用输出会跳过这些副作用，因此不经过本缓存。
+    缓存读写失败只会退化为未命中，不影响主流程。
+
+使用示例:
+    from agent.response_cache import ResponseCache
+
+    cache = ResponseCache("./my_project/.agent_cache.db", ttl_sec=86400)
+    key = ResponseCache.make_key("qwen3-coder:30b", 0.1, [("human", "你好")])
+    if cache.get(key) is None:
+        cache.put(key, "你好！")
+    cache.close()
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+# 每写入多少条记录顺带清理一次过期条目
+_PURGE_EVERY_PUTS = 64
+
+
+class ResponseCache:
+    """
+    SQLite 响应缓存
+
+    单个连接配合内部锁串行访问，可在线程池或事件循环回调中共享。
+    """
+
+    def __init__(self, db_path: str, ttl_sec: int = 86400):
+        """
+        打开（必要时创建）缓存数据库
+
+        参数:
+            db_path: 数据库文件路径
+            ttl_sec: 条目有效期（秒），0 表示永不过期
+
+        说明:
+            打开时清理一次过期条目；打开失败时缓存处于禁用状态。
+        """
+        self.db_path = db_path
+        self.ttl_sec = max(0, int(ttl_sec))
+        self._lock = threading.Lock()
+        self._puts_since_purge = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, output BLOB, ts INTEGER, hits INTEGER DEFAULT 0)"
+            )
+            conn.commit()
+            self._conn = conn
+            self._purge()
+        except sqlite3.Error as exc:
+            print(f"[ResponseCache] 打开缓存失败，已禁用: {exc}")
+            self._conn = None
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        计算内容寻址键
+
+        参数:
+            *parts: 参与计算的内容（需可 JSON 序列化，其余按 str() 处理）
+
+        返回:
+            str: SHA-256 十六进制摘要
+        """
+        payload = json.dumps(parts, ensure_ascii=False, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        读取未过期的缓存输出
+
+        参数:
+            key: make_key() 生成的键
+
+        返回:
+            Optional[str]: 命中时返回输出文本，否则返回 None
+        """
+        if self._conn is None:
+            return None
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT output, ts FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                output, ts = row
+                if self.ttl_sec and ts < int(time.time()) - self.ttl_sec:
+                    return None
+                self._conn.execute("UPDATE cache SET hits = hits + 1 WHERE key = ?", (key,))
+                self._conn.commit()
+            except sqlite3.Error:
+                return None
+        return output.decode("utf-8") if isinstance(output, bytes) else str(output)
+
+    def put(self, key: str, output: str) -> None:
+        """
+        写入（或覆盖）缓存输出
+
+        参数:
+            key: make_key() 生成的键
+            output: 模型输出文本
+        """
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, output, ts, hits) VALUES (?, ?, ?, 0)",
+                    (key, output.encode("utf-8"), int(time.time())),
+                )
+                self._conn.commit()
+                self._puts_since_purge += 1
+                if self._puts_since_purge >= _PURGE_EVERY_PUTS:
+                    self._purge()
+            except sqlite3.Error:
+                pass
+
+    def _purge(self) -> None:
+        """删除过期条目（调用方负责加锁或处于初始化阶段）。"""
+        self._puts_since_purge = 0
+        if self._conn is None or not self.ttl_sec:
+            return
+        try:
+            self._conn.execute(
+                "DELETE FROM cache WHERE ts < ?", (int(time.time()) - self.ttl_sec,)
+            )
+            self._conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """关闭数据库连接，可重复调用。"""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except sqlite3.Error:
+                    pass
+                self._conn = None
@@ -19,8 +19,9 @@
 import os
 import re
 import shlex
-from typing import Tuple, Optional, List
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple, Optional, List
 
 # 导入项目配置
 import sys
@@ -29,6 +30,31 @@ from config import Config, get_project_dir
 from .event_logger import emit_event
 
 
+# 复合控制符检测（&&、||、;、|），预编译为单次扫描
+_COMPOUND_RE = re.compile(r"&&|[|;]")
+
+
+@lru_cache(maxsize=512)
+def split_command(command: str) -> Tuple[str, ...]:
+    """
+    使用 shlex 拆分命令并缓存结果
+
+    参数:
+        command: 命令字符串
+
+    返回:
+        Tuple[str, ...]: 拆分后的参数（元组不可变，可安全共享缓存）
+
+    异常:
+        ValueError: 引号不匹配等无法解析的情况（异常不会被缓存）
+
+    说明:
+        验收命令、会话前检查等会反复执行相同命令，
+        安全校验过程中也会对同一片段多次拆分，缓存可省去重复的词法分析。
+    """
+    return tuple(shlex.split(command))
+
+
 @dataclass
 class SecurityCheckResult:
     """
@@ -41,11 +67,13 @@ class SecurityCheckResult:
         reason: 如果被拒绝，说明拒绝的原因
         sanitized_command: 清理后的安全命令（可选）
         risk_level: 风险等级 (low, medium, high, critical)
+        is_compound: 命令是否包含复合控制符（&&、||、;、|）
     """
     allowed: bool
     reason: str = ""
     sanitized_command: Optional[str] = None
     risk_level: str = "low"
+    is_compound: bool = False
 
 
 class CommandValidator:
@@ -249,7 +277,7 @@ class CommandValidator:
         """
         try:
             # 使用 shlex 正确解析命令
-            parts = shlex.split(command)
+            parts = split_command(command)
             if not parts:
                 return SecurityCheckResult(
                     allowed=False,
@@ -426,7 +454,7 @@ class CommandValidator:
 
         for segment in segments:
             try:
-                tokens = shlex.split(segment)
+                tokens = split_command(segment)
             except ValueError:
                 continue
 
@@ -493,7 +521,7 @@ class CommandValidator:
         if cmd_name == "pkill":
             allowed_processes = {"node", "npm", "npx", "vite", "next", "python", "python3"}
             try:
-                tokens = shlex.split(cmd_segment)
+                tokens = split_command(cmd_segment)
             except ValueError:
                 return SecurityCheckResult(
                     allowed=False,
@@ -523,7 +551,7 @@ class CommandValidator:
         # chmod 验证 - 只允许 +x 模式
         elif cmd_name == "chmod":
             try:
-                tokens = shlex.split(cmd_segment)
+                tokens = split_command(cmd_segment)
             except ValueError:
                 return SecurityCheckResult(
                     allowed=False,
@@ -587,7 +615,7 @@ class CommandValidator:
             command: 要验证的命令
 
         返回:
-            SecurityCheckResult: 验证结果
+            SecurityCheckResult: 验证结果（通过时 is_compound 标明是否为复合命令）
         """
         # 首先进行基础验证
         base_result = self.validate(command)
@@ -599,7 +627,7 @@ class CommandValidator:
         if not commands:
             # 解析失败时回退到 shlex 的首命令提取，避免误伤合法命令
             try:
-                parts = shlex.split(command)
+                parts = split_command(command)
             except ValueError as exc:
                 return SecurityCheckResult(
                     allowed=False,
@@ -637,7 +665,8 @@ class CommandValidator:
         return SecurityCheckResult(
             allowed=True,
             sanitized_command=command,
-            risk_level="low"
+            risk_level="low",
+            is_compound=_COMPOUND_RE.search(command) is not None,
         )
 
 
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+常驻 Bash 工作进程模块 (shell_worker.py)
+======================================
+
+本模块提供一个长期存活的 `bash -l` 进程，用于复用 Shell 启动开销：
+- 登录 Shell 的 profile 只在进程启动时加载一次
+- 每条命令在子 Shell `( ... )` 中执行，`cd`/`export` 不会泄漏到后续命令
+- 命令的标准输入重定向到 /dev/null，避免误读协议数据
+- 通过唯一哨兵行区分每条命令的输出与返回码
+- 超时后直接终止整个进程组，下次调用时自动重建
+
+使用示例:
+    from agent.shell_worker import PersistentBashWorker
+
+    worker = PersistentBashWorker("./my_project")
+    completed = worker.run("ls -la && echo done", timeout=60)
+    print(completed.returncode, completed.stdout)
+    worker.close()
+"""
+
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from typing import IO, List, Optional, Tuple
+
+
+class PersistentBashWorker:
+    """
+    常驻 Bash 工作进程
+
+    所有调用串行执行（内部加锁），适合会话前检查、验收命令等
+    大量短小的复合命令场景。
+    """
+
+    def __init__(self, cwd: str):
+        """
+        初始化工作进程包装器
+
+        参数:
+            cwd: 工作进程的启动目录
+
+        说明:
+            进程在首次调用 run() 时才会启动。
+        """
+        self.cwd = os.path.abspath(cwd)
+        self._proc: Optional[subprocess.Popen] = None
+        self._stdout_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stderr_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _drain(stream: IO[str], line_queue: "queue.Queue[Optional[str]]") -> None:
+        """持续读取输出流并放入队列，流结束时放入 None。"""
+        for line in iter(stream.readline, ""):
+            line_queue.put(line)
+        line_queue.put(None)
+
+    def is_alive(self) -> bool:
+        """判断工作进程是否仍在运行。"""
+        return self._proc is not None and self._proc.poll() is None
+
+    def _start(self, timeout: float) -> None:
+        """
+        启动工作进程并丢弃 profile 启动阶段的输出
+
+        参数:
+            timeout: 等待启动完成的超时秒数
+        """
+        self._proc = subprocess.Popen(
+            ["bash", "-l"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=self.cwd,
+            text=True,
+            bufsize=1,
+            start_new_session=True,
+        )
+        self._stdout_queue = queue.Queue()
+        self._stderr_queue = queue.Queue()
+        for stream, line_queue in (
+            (self._proc.stdout, self._stdout_queue),
+            (self._proc.stderr, self._stderr_queue),
+        ):
+            threading.Thread(target=self._drain, args=(stream, line_queue), daemon=True).start()
+
+        sentinel = self._new_sentinel()
+        self._write(f"printf '\\n{sentinel}0\\n'; printf '\\n{sentinel}\\n' >&2\n")
+        deadline = time.monotonic() + timeout
+        self._read_until(self._stdout_queue, sentinel, deadline, "bash -l")
+        self._read_until(self._stderr_queue, sentinel, deadline, "bash -l")
+
+    @staticmethod
+    def _new_sentinel() -> str:
+        """生成本次命令唯一的哨兵前缀。"""
+        return f"__AGENT_CMD_END_{uuid.uuid4().hex}__"
+
+    def _write(self, script: str) -> None:
+        """向工作进程写入脚本片段。"""
+        self._proc.stdin.write(script)
+        self._proc.stdin.flush()
+
+    @staticmethod
+    def _read_until(
+        line_queue: "queue.Queue[Optional[str]]",
+        sentinel: str,
+        deadline: float,
+        command: str,
+        cap: Optional[int] = None,
+    ) -> Tuple[List[str], str]:
+        """
+        读取输出直到哨兵行
+
+        参数:
+            cap: 保留的最大字符数（可选）；超出部分继续读取但直接丢弃。
+                额外多保留 2 个字符：1 个抵消 _join_output 去掉的末尾换行，
+                1 个供调用方判断是否截断
+
+        返回:
+            Tuple[List[str], str]: (哨兵前的输出行, 哨兵后的附加内容)
+
+        异常:
+            subprocess.TimeoutExpired: 超过截止时间
+            RuntimeError: 工作进程意外退出
+        """
+        lines: List[str] = []
+        kept = 0
+        limit = None if cap is None else cap + 2
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(command, 0)
+            try:
+                line = line_queue.get(timeout=remaining)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(command, 0)
+            if line is None:
+                raise RuntimeError("Bash 工作进程意外退出")
+            if line.startswith(sentinel):
+                return lines, line[len(sentinel):].strip()
+            if limit is None:
+                lines.append(line)
+            elif kept < limit:
+                line = line[:limit - kept]
+                lines.append(line)
+                kept += len(line)
+
+    @staticmethod
+    def _join_output(lines: List[str]) -> str:
+        """拼接输出并去掉哨兵前额外写入的换行。"""
+        text = "".join(lines)
+        return text[:-1] if text.endswith("\n") else text
+
+    def run(
+        self, command: str, timeout: float, output_cap: Optional[int] = None
+    ) -> subprocess.CompletedProcess:
+        """
+        在工作进程中执行命令
+
+        参数:
+            command: 已通过安全校验的 Shell 命令
+            timeout: 超时秒数
+            output_cap: stdout/stderr 各自保留的最大字符数（可选，None 表示不限制）
+
+        返回:
+            subprocess.CompletedProcess: 与 subprocess.run 一致的结果结构
+
+        异常:
+            subprocess.TimeoutExpired: 命令超时（工作进程会被终止）
+        """
+        with self._lock:
+            try:
+                if not self.is_alive():
+                    self._start(timeout)
+
+                sentinel = self._new_sentinel()
+                self._write(
+                    f"( {command}\n) < /dev/null\n"
+                    "__agent_rc=$?\n"
+                    f"printf '\\n{sentinel}%s\\n' \"$__agent_rc\"\n"
+                    f"printf '\\n{sentinel}\\n' >&2\n"
+                )
+                deadline = time.monotonic() + timeout
+                stdout_lines, returncode_text = self._read_until(
+                    self._stdout_queue, sentinel, deadline, command, output_cap
+                )
+                stderr_lines, _ = self._read_until(
+                    self._stderr_queue, sentinel, deadline, command, output_cap
+                )
+            except subprocess.TimeoutExpired:
+                self._kill()
+                raise subprocess.TimeoutExpired(command, timeout)
+            except (OSError, RuntimeError):
+                self._kill()
+                raise
+
+            try:
+                returncode = int(returncode_text)
+            except ValueError:
+                returncode = 1
+
+            return subprocess.CompletedProcess(
+                args=["bash", "-c", command],
+                returncode=returncode,
+                stdout=self._join_output(stdout_lines),
+                stderr=self._join_output(stderr_lines),
+            )
+
+    def _kill(self) -> None:
+        """终止工作进程及其进程组内的所有子进程。"""
+        if self._proc is None:
+            return
+        try:
+            os.killpg(self._proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+        try:
+            self._proc.wait(timeout=1)
+        except Exception:
+            pass
+        self._proc = None
+
+    def close(self) -> None:
+        """正常退出工作进程，失败时强制终止。"""
+        with self._lock:
+            if not self.is_alive():
+                self._proc = None
+                return
+            try:
+                self._write("exit\n")
+                self._proc.wait(timeout=1)
+                self._proc = None
+            except Exception:
+                self._kill()
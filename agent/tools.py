@@ -18,15 +18,13 @@
 
 import os
 import subprocess
-import shlex
-import re
 import time
 import glob as glob_module
 from typing import Optional, List, Any, Tuple, Dict
 from langchain_core.tools import tool, StructuredTool
 
 # 导入安全模块和配置
-from .security import get_validator
+from .security import get_validator, split_command
 from config import get_project_dir, Config
 from .event_logger import emit_event
 
@@ -465,19 +463,6 @@ def search_code(query: str, directory: str = ".", file_pattern: str = "*") -> st
 # Bash 命令执行工具
 # ============================================
 
-def _is_compound_shell_command(command: str) -> bool:
-    """
-    判断命令是否为复合 Shell 命令。
-
-    参数:
-        command: 原始命令字符串
-
-    返回:
-        bool: 如果包含控制符（如 &&、||、;、|）则返回 True
-    """
-    return bool(re.search(r'&&|\|\||;|\|', command))
-
-
 def _classify_tool_result(result_text: str) -> Tuple[bool, str]:
     """
     根据工具返回文本判断执行状态
@@ -560,7 +545,8 @@ def _wrap_tool_invoke(tool_obj: Any) -> Any:
             raise
 
         duration = round(time.time() - start_time, 3)
-        success, status = _classify_tool_result(str(result))
+        result_text = str(result)
+        success, status = _classify_tool_result(result_text)
         emit_event(
             event_type="tool_result",
             component="tool",
@@ -569,7 +555,7 @@ def _wrap_tool_invoke(tool_obj: Any) -> Any:
                 "status": status,
                 "returncode": 0 if success else 1,
                 "duration_sec": duration,
-                "stdout_preview": str(result),
+                "stdout_preview": result_text,
             },
             ok=success,
             phase="run",
@@ -639,13 +625,13 @@ def run_bash(command: str, timeout: int = 60) -> str:
         work_dir = get_project_dir()
 
         # 执行命令（默认使用 shell=False，避免直接注入风险）
-        if _is_compound_shell_command(command):
+        if check_result.is_compound:
             # 复合命令在通过验证后，交由 bash -lc 解释执行
             exec_args = ["bash", "-lc", command]
             execution_mode = "复合命令模式"
         else:
             # 单命令模式通过 shlex 安全拆分参数
-            exec_args = shlex.split(command)
+            exec_args = list(split_command(command))
             execution_mode = "单命令模式"
 
         if not exec_args:
@@ -55,6 +55,26 @@ class Config:
     # 根据所接入模型服务的限制设置
     MAX_TOKENS: int = 4096
 
+    # 是否在系统提示词上附加 cache_control 标记（服务端前缀缓存）
+    # 仅在模型服务支持该字段时开启，普通 OpenAI 兼容服务保持关闭
+    PROMPT_CACHE_CONTROL: bool = False
+
+    # 批量异步调用模型（ainvoke_many）时的最大并发请求数
+    MAX_CONCURRENT_LLM: int = 4
+
+    # 是否缓存回退执行器（不调用工具的纯文本调用）的模型响应
+    # 以 (模型, 温度, 完整消息列表) 的 SHA-256 为键，命中时不再请求模型
+    RESPONSE_CACHE_ENABLED: bool = False
+
+    # 响应缓存 SQLite 文件名（位于项目目录下，开启时自动加入 .gitignore）
+    RESPONSE_CACHE_FILE: str = ".agent_cache.db"
+
+    # 响应缓存条目有效期（秒），0 表示永不过期
+    RESPONSE_CACHE_TTL_SEC: int = 86400
+
+    # 温度高于该值时不启用响应缓存（高温输出本应带有随机性）
+    RESPONSE_CACHE_MAX_TEMPERATURE: float = 0.1
+
     # 允许执行的 Bash 命令白名单
     # 留空表示允许所有不在黑名单中的命令
     ALLOWED_COMMANDS: List[str] = field(default_factory=list)
@@ -86,28 +106,56 @@ class Config:
     # 用于控制 prompt 长度
     MAX_HISTORY_MESSAGES: int = 20
 
-    # 会话之间的自动继续延迟（秒）
+    # 会话之间的自动继续延迟（秒）：两轮开始时间的最小间隔，本轮耗时更长时不再等待
     AUTO_CONTINUE_DELAY: float = 3.0
 
     # 命令执行默认超时时间（秒）
     # 用于 run_bash 等通用命令执行场景
     COMMAND_TIMEOUT: int = 60
 
+    # 是否复用常驻 bash 进程执行复合命令（会话前检查、验收命令）
+    # 每条命令仍在独立子 Shell 中运行；超时会终止整个工作进程并在下次自动重建
+    PERSISTENT_BASH_WORKER: bool = False
+
     # 会话前检查（如 init.sh）超时时间（秒）
     SESSION_PRECHECK_TIMEOUT: int = 120
 
+    # init.sh 内容未变化时复用上次成功的会话前检查结果的有效期（秒）
+    # 默认 0 表示每轮都执行（init.sh 之外的依赖变化也需要被健康检查发现），按需开启
+    PRECHECK_TTL_SEC: int = 0
+
     # 功能验收测试命令超时时间（秒）
     VERIFICATION_TIMEOUT: int = 300
 
+    # 是否并发执行同一功能的多条验收命令
+    # 仅当各命令相互独立时开启；默认按顺序执行（如先安装依赖再跑测试）
+    PARALLEL_VERIFY: bool = False
+
     # 功能连续失败后的冷却秒数（用于避免 in_progress 永久霸占）
     FEATURE_FAILURE_COOLDOWN_SECONDS: int = 300
 
     # 功能连续失败达到阈值后，自动转为 blocked
     FEATURE_MAX_CONSECUTIVE_FAILURES: int = 3
 
+    # 连续模式下同一功能连续失败达到该轮数时提前结束（0 表示不限制）
+    CONTINUOUS_MAX_REPEATED_FAILURES: int = 3
+
     # 迭代运行日志文件名
     RUN_LOG_FILE: str = "run_logs.jsonl"
 
+    # 运行日志缓冲条数（达到该数量时批量写入，退出或 close() 时兜底刷新）
+    RUN_LOG_BUFFER_SIZE: int = 64
+
+    # 运行日志缓冲最长停留时间（秒），超过后下一次追加时立即刷新；每轮 run() 结束时也会刷新
+    RUN_LOG_FLUSH_INTERVAL_SEC: float = 0.5
+
+    # 运行日志每写入多少条记录执行一次 fsync（0 表示从不 fsync，只 flush 到操作系统）
+    RUN_LOG_FSYNC_INTERVAL: int = 0
+
+    # 运行日志是否以整数 Unix 时间戳字段 ts 代替格式化的 timestamp 字段
+    # 开启后可用 scripts/show_run_log.py 查看可读时间
+    RUN_LOG_EPOCH_TS: bool = False
+
     # 事件日志文件名（终端事件的结构化落盘）
     EVENT_LOG_FILE: str = "events.jsonl"
 
@@ -120,6 +168,9 @@ class Config:
     # 事件日志文本预览长度
     EVENT_PREVIEW_LENGTH: int = 300
 
+    # 命令 stdout/stderr 保留的最大字节数，超出部分不解码直接丢弃
+    COMMAND_OUTPUT_CAP_BYTES: int = 64 * 1024
+
     # 上下文压缩相关阈值（按字符数近似控制 token）
     CONTEXT_TOTAL_MAX_CHARS: int = 12000
     CONTEXT_PROGRESS_MAX_CHARS: int = 4000
@@ -23,8 +23,8 @@
 
 import os
 import sys
+import time
 import click
-from datetime import datetime
 from typing import Optional
 
 # 确保项目根目录在 Python 路径中
@@ -101,7 +101,7 @@ def _build_session_id(command_name: str) -> str:
     返回:
         str: 格式化的会话 ID
     """
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    timestamp = time.strftime("%Y%m%d%H%M%S")
     return f"{command_name}-{timestamp}"
 
 
@@ -611,8 +611,10 @@ def chat(ctx, project_dir):
 @click.option('--desc', '-d', default='', help='功能描述')
 @click.option('--priority', '-p', default='medium', type=click.Choice(['high', 'medium', 'low']), help='优先级')
 @click.option('--verify', 'verify_commands', multiple=True, help='验收命令（可多次传入）')
+@click.option('--parallel-verify/--serial-verify', 'verify_parallel', default=None,
+              help='验收命令并发/顺序执行（默认沿用 Config.PARALLEL_VERIFY）')
 @click.pass_context
-def add_feature(ctx, project_dir, feature_id, name, desc, priority, verify_commands):
+def add_feature(ctx, project_dir, feature_id, name, desc, priority, verify_commands, verify_parallel):
     """
     添加新功能到项目
 
@@ -622,6 +624,7 @@ def add_feature(ctx, project_dir, feature_id, name, desc, priority, verify_comma
     示例:
       python main.py add-feature ./my_app --id feat-005 --name "用户登录" --priority high
       python main.py add-feature ./my_app --id feat-006 --name "导出报告" --verify "python -m pytest -q"
+      python main.py add-feature ./my_app --id feat-007 --name "静态检查" --verify "ruff check ." --verify "mypy ." --parallel-verify
     """
     progress_manager = ProgressManager(project_dir)
 
@@ -630,7 +633,8 @@ def add_feature(ctx, project_dir, feature_id, name, desc, priority, verify_comma
         name=name,
         description=desc,
         priority=priority,
-        verify_commands=list(verify_commands) if verify_commands else None
+        verify_commands=list(verify_commands) if verify_commands else None,
+        verify_commands_parallel=verify_parallel
     )
 
     if success:
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+导入耗时回归检查脚本 (check_import_cost.py)
+=========================================
+
+在全新解释器中测量 `import agent` 的开销，防止有人重新引入
+包级别的急切导入（如 `from .agent import CodingAgent`）。
+
+检查项：
+- `python -X importtime` 报告的 agent 包累计导入耗时
+- 相比裸解释器，`import agent` 新增的 sys.modules 数量
+
+使用方式:
+    python scripts/check_import_cost.py
+
+超过阈值时以非零状态码退出，并打印耗时最高的导入链。
+"""
+
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+# 项目根目录（agent 包所在目录）
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# agent 包累计导入耗时上限（微秒）
+MAX_CUMULATIVE_US = 50_000
+
+# import agent 允许新增的模块数量上限
+MAX_MODULE_DELTA = 15
+
+
+def _run_python(args: List[str]) -> subprocess.CompletedProcess:
+    """
+    在项目根目录下启动全新解释器执行参数
+
+    参数:
+        args: 传递给解释器的参数列表
+
+    返回:
+        subprocess.CompletedProcess: 执行结果
+    """
+    return subprocess.run(
+        [sys.executable] + args,
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[int, int, str]]:
+    """
+    解析 -X importtime 输出
+
+    参数:
+        stderr: 解释器标准错误输出
+
+    返回:
+        List[Tuple[int, int, str]]: (自身耗时, 累计耗时, 模块名) 列表
+    """
+    entries: List[Tuple[int, int, str]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            # 跳过表头行
+            continue
+        entries.append((self_us, cumulative_us, parts[2].rstrip()))
+    return entries
+
+
+def check_import_time() -> bool:
+    """
+    检查 agent 包的累计导入耗时
+
+    返回:
+        bool: 是否在阈值内
+    """
+    result = _run_python(["-X", "importtime", "-c", "import agent"])
+    if result.returncode != 0:
+        print(f"✗ import agent 失败:\n{result.stderr}")
+        return False
+
+    entries = _parse_importtime(result.stderr)
+    agent_entries = [entry for entry in entries if entry[2].strip() == "agent"]
+    if not agent_entries:
+        print("✗ 未在 importtime 输出中找到 agent 包")
+        return False
+
+    cumulative_us = agent_entries[-1][1]
+    if cumulative_us < MAX_CUMULATIVE_US:
+        print(f"✓ import agent 累计耗时 {cumulative_us} us (上限 {MAX_CUMULATIVE_US} us)")
+        return True
+
+    print(f"✗ import agent 累计耗时 {cumulative_us} us，超过上限 {MAX_CUMULATIVE_US} us")
+    print("耗时最高的导入链:")
+    for self_us, total_us, name in sorted(entries, key=lambda e: e[1], reverse=True)[:10]:
+        print(f"  {total_us:>10} us (self {self_us:>8} us) {name}")
+    return False
+
+
+def check_module_delta() -> bool:
+    """
+    检查 import agent 新增的模块数量
+
+    返回:
+        bool: 是否在阈值内
+    """
+    script = "import sys; before = set(sys.modules); import agent; print('\\n'.join(sorted(set(sys.modules) - before)))"
+    result = _run_python(["-c", script])
+    if result.returncode != 0:
+        print(f"✗ import agent 失败:\n{result.stderr}")
+        return False
+
+    new_modules = [line for line in result.stdout.splitlines() if line.strip()]
+    if len(new_modules) <= MAX_MODULE_DELTA:
+        print(f"✓ import agent 新增模块 {len(new_modules)} 个 (上限 {MAX_MODULE_DELTA})")
+        return True
+
+    print(f"✗ import agent 新增模块 {len(new_modules)} 个，超过上限 {MAX_MODULE_DELTA}")
+    for name in new_modules:
+        print(f"  {name}")
+    return False
+
+
+def main() -> int:
+    """执行全部检查并返回退出码。"""
+    time_ok = check_import_time()
+    delta_ok = check_module_delta()
+    return 0 if (time_ok and delta_ok) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行日志查看脚本 (show_run_log.py)
+================================
+
+逐行读取 run_logs.jsonl，将 `ts`（整数 Unix 时间戳）展开为
+"%Y-%m-%d %H:%M:%S" 格式的 `timestamp` 字段后输出。
+已带 `timestamp` 字段的旧格式记录原样输出。
+
+使用方式:
+    python scripts/show_run_log.py ./my_project/run_logs.jsonl
+    python scripts/show_run_log.py ./my_project/run_logs.jsonl --tail 20
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from typing import Any, Dict, Iterable
+
+
+def expand_timestamp(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将记录中的 ts 字段展开为可读时间
+
+    参数:
+        record: 运行日志记录
+
+    返回:
+        Dict[str, Any]: timestamp 位于首位的新记录
+    """
+    if "ts" not in record:
+        return record
+    rest = {key: value for key, value in record.items() if key != "ts"}
+    try:
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(int(record["ts"])))
+    except (TypeError, ValueError, OverflowError):
+        return record
+    return {"timestamp": timestamp, **rest}
+
+
+def iter_records(lines: Iterable[str]) -> Iterable[Dict[str, Any]]:
+    """解析 JSONL 行，跳过空行与损坏行。"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
+
+def main() -> int:
+    """脚本入口。"""
+    parser = argparse.ArgumentParser(description="查看 run_logs.jsonl（展开 ts 时间戳）")
+    parser.add_argument("path", help="run_logs.jsonl 文件路径")
+    parser.add_argument("--tail", type=int, default=0, help="只输出最后 N 条记录")
+    args = parser.parse_args()
+
+    try:
+        with open(args.path, "r", encoding="utf-8") as file_obj:
+            records = iter_records(file_obj)
+            if args.tail > 0:
+                records = deque(records, maxlen=args.tail)
+            for record in records:
+                print(json.dumps(expand_timestamp(record), ensure_ascii=False))
+    except OSError as exc:
+        print(f"读取失败: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())